@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import AsyncIterator, Optional, Any
 from enum import Enum
 
+import numpy as np
+
 
 # ==================== Global ID 定义 ====================
 
@@ -53,6 +55,15 @@ class OrderBookLevel:
     size: float
 
 
+def _levels_to_arrays(levels: list[OrderBookLevel]) -> tuple[np.ndarray, np.ndarray]:
+    """档位列表 -> (prices, sizes) 两个连续 float64 数组"""
+    arr = np.array(
+        [(level.price, level.size) for level in levels], dtype=np.float64
+    ).reshape(-1, 2)
+    prices, sizes = np.ascontiguousarray(arr.T)
+    return prices, sizes
+
+
 @dataclass
 class OrderBook:
     """订单簿快照"""
@@ -61,6 +72,29 @@ class OrderBook:
     bids: list[OrderBookLevel]
     asks: list[OrderBookLevel]
     
+    # 价格/数量的并行数组投影 (SoA)，首次访问时构建整本深度;
+    # 只在需要遍历多档时使用 (如 VWAP)，读前几档直接访问 bids / asks
+    _bid_arrays: Optional[tuple[np.ndarray, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _ask_arrays: Optional[tuple[np.ndarray, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def bid_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """买盘 (prices, sizes) float64 数组，供向量化计算使用"""
+        if self._bid_arrays is None:
+            self._bid_arrays = _levels_to_arrays(self.bids)
+        return self._bid_arrays
+    
+    @property
+    def ask_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """卖盘 (prices, sizes) float64 数组，供向量化计算使用"""
+        if self._ask_arrays is None:
+            self._ask_arrays = _levels_to_arrays(self.asks)
+        return self._ask_arrays
+    
     @property
     def best_bid(self) -> Optional[float]:
         return self.bids[0].price if self.bids else None
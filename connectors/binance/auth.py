@@ -127,6 +127,11 @@ class BinanceAuth:
         self.sign_type = sign_type
         self._time_offset: int = 0
         
+        # HMAC 密钥预处理一次，签名时复制模板状态
+        self._hmac_template = None
+        if sign_type == "HMAC":
+            self._hmac_template = hmac.new(api_secret.encode('utf-8'), digestmod=hashlib.sha256)
+        
         # 加载 Ed25519 私钥
         self._ed25519_key = None
         if sign_type == "Ed25519":
@@ -149,12 +154,9 @@ class BinanceAuth:
     
     def _sign_hmac(self, query_string: str) -> str:
         """HMAC-SHA256 签名"""
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        mac = self._hmac_template.copy()
+        mac.update(query_string.encode('utf-8'))
+        return mac.hexdigest()
     
     def _sign_ed25519(self, query_string: str) -> str:
         """Ed25519 签名"""
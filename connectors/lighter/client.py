@@ -305,20 +305,9 @@ class LighterConnector(BaseConnector):
         if self._ws_orderbook and self._ws_orderbook.is_running:
             snapshot = self._ws_orderbook.get_orderbook(market_id)
             if snapshot:
-                # 转换格式: {price: size} -> [OrderBookLevel]
-                bids = sorted(
-                    [(float(p), float(s)) for p, s in snapshot.bids.items()],
-                    key=lambda x: x[0], reverse=True
-                )
-                asks = sorted(
-                    [(float(p), float(s)) for p, s in snapshot.asks.items()],
-                    key=lambda x: x[0]
-                )
-                
-                # 限制档数
-                if depth > 0:
-                    bids = bids[:depth]
-                    asks = asks[:depth]
+                # 转换格式: {price: size} -> [OrderBookLevel] (只排序所需档数)
+                bids = snapshot.top_bids(depth)
+                asks = snapshot.top_asks(depth)
                 
                 return OrderBook(
                     symbol=symbol,
@@ -3,16 +3,54 @@ WebSocket 订单簿管理器
 
 通过 WebSocket 实时订阅订单簿，提供最新深度数据。
 """
+import heapq
 import logging
 import threading
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 from dataclasses import dataclass
+from itertools import islice
 
 import lighter
+import numpy as np
+from sortedcontainers import SortedDict
 
 logger = logging.getLogger(__name__)
 
+# 深度超过该档数时用 NumPy argpartition 选取前 N 档，否则用 heapq
+NUMPY_TOP_N_THRESHOLD = 64
+
+# 增量推送可能缺少某一侧: 共享的空默认值，避免每次 .get 新建空容器
+_NO_LEVELS = ()
+
+
+def _top_levels(levels: Dict[str, str], n: int, descending: bool) -> List[Tuple[float, float]]:
+    """
+    选取前 n 档 (按价格排序)
+    
+    Args:
+        levels: {price: size}
+        n: 档数，0 表示全部
+        descending: True 为买盘 (价格从高到低)
+    """
+    count = len(levels)
+    if n <= 0 or n >= count:
+        parsed = [(float(p), float(s)) for p, s in levels.items()]
+        parsed.sort(reverse=descending)
+        return parsed
+    
+    if count <= NUMPY_TOP_N_THRESHOLD:
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        top = pick(n, ((float(p), s) for p, s in levels.items()))
+        return [(p, float(s)) for p, s in top]
+    
+    # 深盘口: 连续 float64 数组上 O(N) 分区，只对选出的 n 档排序
+    keys = list(levels)
+    prices = np.fromiter(map(float, keys), dtype=np.float64, count=count)
+    idx = np.argpartition(-prices if descending else prices, n - 1)[:n]
+    top = sorted(((prices[i], keys[i]) for i in idx.tolist()), reverse=descending)
+    return [(float(p), float(levels[k])) for p, k in top]
+
 
 @dataclass
 class OrderBookSnapshot:
@@ -38,6 +76,14 @@ class OrderBookSnapshot:
         price = min(self.asks.keys(), key=float)
         return (float(price), float(self.asks[price]))
     
+    def top_bids(self, n: int = 0) -> List[Tuple[float, float]]:
+        """买盘前 n 档 [(price, size)]，价格从高到低，0 表示全部"""
+        return _top_levels(self.bids, n, descending=True)
+    
+    def top_asks(self, n: int = 0) -> List[Tuple[float, float]]:
+        """卖盘前 n 档 [(price, size)]，价格从低到高，0 表示全部"""
+        return _top_levels(self.asks, n, descending=False)
+    
     @property
     def mid_price(self) -> Optional[float]:
         """中间价"""
@@ -57,6 +103,81 @@ class OrderBookSnapshot:
         return None
 
 
+class LocalOrderBook:
+    """
+    本地订单簿
+    
+    bids / asks 为按价格 (float) 排序的 SortedDict: 增量更新 O(log N)，
+    取前 N 档直接按序迭代，无需每次推送重新排序。
+    价格与数量在写入时统一解析为 float，下游不再重复解析字符串。
+    """
+    
+    def __init__(self):
+        self.bids = SortedDict()
+        self.asks = SortedDict()
+    
+    def reset(self, order_book: dict) -> None:
+        """用全量快照重建"""
+        self.bids.clear()
+        self.asks.clear()
+        self.apply(order_book)
+    
+    def apply(self, order_book: dict) -> None:
+        """应用增量更新 (size 为 0 表示删除该档)"""
+        self._apply_side(self.bids, order_book.get('bids', _NO_LEVELS))
+        self._apply_side(self.asks, order_book.get('asks', _NO_LEVELS))
+    
+    @staticmethod
+    def _apply_side(book: SortedDict, levels) -> None:
+        # 档位格式: list[{price, size}] 或 {price: size}
+        if isinstance(levels, dict):
+            levels = ({'price': p, 'size': s} for p, s in levels.items())
+        
+        for level in levels:
+            price = float(level['price'])
+            size = float(level['size'])
+            if size == 0:
+                book.pop(price, None)
+            else:
+                book[price] = size
+    
+    def top_bids(self, n: int = 5) -> List[Tuple[float, float]]:
+        """买盘前 n 档 (价格从高到低)"""
+        return [(price, self.bids[price]) for price in islice(reversed(self.bids), n)]
+    
+    def top_asks(self, n: int = 5) -> List[Tuple[float, float]]:
+        """卖盘前 n 档 (价格从低到高)"""
+        return list(islice(self.asks.items(), n))
+
+
+class LocalOrderBookWsClient(lighter.WsClient):
+    """
+    维护 LocalOrderBook 的 WsClient
+    
+    覆盖 SDK 的 handle_subscribed_order_book / handle_update_order_book
+    (由 WsClient.on_message 按消息类型分发): 订阅快照重建本地订单簿，
+    增量推送直接写入 SortedDict，回调收到 (market_id, LocalOrderBook)。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.local_books: Dict[str, LocalOrderBook] = {}
+    
+    def handle_subscribed_order_book(self, message):
+        market_id = message["channel"].split(":")[1]
+        book = self.local_books.setdefault(market_id, LocalOrderBook())
+        book.reset(message["order_book"])
+        if self.on_order_book_update:
+            self.on_order_book_update(market_id, book)
+    
+    def handle_update_order_book(self, message):
+        market_id = message["channel"].split(":")[1]
+        book = self.local_books.setdefault(market_id, LocalOrderBook())
+        book.apply(message["order_book"])
+        if self.on_order_book_update:
+            self.on_order_book_update(market_id, book)
+
+
 class WebSocketOrderBook:
     """
     WebSocket 订单簿管理器
@@ -9,7 +9,7 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Callable
+from typing import Any, Optional, Dict, Callable
 
 from connectors.base import BaseConnector, OrderResult, OrderSide, OrderType
 from connectors.retry import retry_async, RetryConfig, NonceManager
@@ -19,6 +19,7 @@ from core.exceptions import (
     NonceConflictError,
 )
 from engine.event_bus import EventBus, Event, EventType
+from risk.manager import Side
 from strategies.base import Signal, SignalAction
 
 logger = logging.getLogger(__name__)
@@ -66,7 +67,7 @@ class OrderTask:
     def to_global_id(self) -> str:
         """生成 Global Order ID"""
         ts = int(self.created_at.timestamp())
-        side = "BUY" if self.signal.action == SignalAction.BUY else "SELL"
+        side = "BUY" if self.signal.action is SignalAction.BUY else "SELL"
         return f"ORD_{side}_{ts}_{id(self) % 10000}"
 
 
@@ -133,14 +134,15 @@ class ExecutionEngine:
         self._cleanup_task: Optional[asyncio.Task] = None  # 后台清理任务
         self._running = False
         self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # start() 时绑定
         
         # 回调
         self._on_order_complete: Optional[Callable[[OrderTask], None]] = None
         
-        # 注册账户 WS 回调
+        # 注册账户 WS 回调 (WS 线程 -> 事件循环线程)
         if self.account_ws:
-            self.account_ws.on_fill(self._on_ws_fill)
-            self.account_ws.on_order_update(self._on_ws_order_update)
+            self.account_ws.on_fill(self._threadsafe(self._on_ws_fill))
+            self.account_ws.on_order_update(self._threadsafe(self._on_ws_order_update))
 
     
     # ==================== 生命周期 ====================
@@ -152,6 +154,7 @@ class ExecutionEngine:
         
         self._running = True
         self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._loop = asyncio.get_running_loop()
         
         # 启动工作协程
         for i in range(self.max_concurrent):
@@ -229,9 +232,9 @@ class ExecutionEngine:
         """
         # 风控检查 (如果配置了 RiskManager)
         if self.risk_manager:
-            side_str = "BUY" if signal.action == SignalAction.BUY else "SELL"
+            side = Side.BUY if signal.action is SignalAction.BUY else Side.SELL
             order_price = price or signal.price
-            self.risk_manager.check_order(symbol, side_str, size, order_price)
+            self.risk_manager.check_order(symbol, side, size, order_price)
         
         task = OrderTask(
             priority=priority,
@@ -355,7 +358,7 @@ class ExecutionEngine:
             order_type = OrderType.LIMIT
         
         # 确定方向
-        side = OrderSide.BUY if task.signal.action == SignalAction.BUY else OrderSide.SELL
+        side = OrderSide.BUY if task.signal.action is SignalAction.BUY else OrderSide.SELL
         
         try:
             # 带重试的订单提交
@@ -465,9 +468,7 @@ class ExecutionEngine:
         while self._running:
             try:
                 await asyncio.sleep(self._cleanup_interval)
-                cleaned = self._cleanup_expired_tasks()
-                if cleaned > 0:
-                    logger.info(f"🧹 已清理 {cleaned} 个过期订单任务")
+                self._cleanup_once()
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -475,6 +476,20 @@ class ExecutionEngine:
         
         logger.debug("清理任务已停止")
     
+    def _cleanup_once(self) -> int:
+        """
+        执行一轮清理 (清理循环的单次迭代)
+        
+        可重复调用，测试中可直接触发而无需等待清理间隔。
+        
+        Returns:
+            清理的任务数量
+        """
+        cleaned = self._cleanup_expired_tasks()
+        if cleaned > 0:
+            logger.info(f"🧹 已清理 {cleaned} 个过期订单任务")
+        return cleaned
+    
     def _cleanup_expired_tasks(self) -> int:
         """
         清除过期订单任务 (防止内存泄漏)
@@ -508,7 +523,25 @@ class ExecutionEngine:
     
     def force_cleanup(self) -> int:
         """手动触发清理 (用于调试)"""
-        return self._cleanup_expired_tasks()
+        return self._cleanup_once()
+    
+    def reset(self) -> None:
+        """
+        清空所有任务记录并重置风控状态 (不停止 worker)
+        
+        用于测试间复用同一引擎实例，调用时不应有执行中的订单。
+        """
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+        
+        self._tasks.clear()
+        self._pending.clear()
+        self._completed.clear()
+        self._exchange_order_map.clear()
+        
+        if self.risk_manager:
+            self.risk_manager.reset()
     
     # ==================== 状态查询 ====================
     
@@ -546,6 +579,22 @@ class ExecutionEngine:
     
     # ==================== WebSocket 回调 ====================
     
+    def _threadsafe(self, handler: Callable[[Any], None]) -> Callable[[Any], None]:
+        """
+        包装账户 WS 回调: 转交事件循环线程执行
+        
+        WS 客户端在后台线程回调，而风控 (PnL 累加、熔断) 与任务状态
+        只在事件循环线程修改，因此 RiskManager 无需加锁。
+        引擎未启动时直接同步执行。
+        """
+        def callback(payload) -> None:
+            loop = self._loop
+            if loop is not None and loop.is_running():
+                loop.call_soon_threadsafe(handler, payload)
+            else:
+                handler(payload)
+        return callback
+    
     def _on_ws_fill(self, fill: "FillEvent") -> None:
         """处理 WebSocket 成交通知"""
         order_id = str(fill.order_index)
@@ -572,7 +621,7 @@ class ExecutionEngine:
             try:
                 # 获取 symbol (需要从 market_id 反查)
                 symbol = task.symbol
-                side = "BUY" if task.signal.action.value == "buy" else "SELL"
+                side = "BUY" if task.signal.action is SignalAction.BUY else "SELL"
                 
                 fill_data = {
                     "symbol": symbol,
@@ -13,6 +13,24 @@ from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# 默认连接参数: WAL 日志 + NORMAL 同步 (WAL 下仍保证一致性)，临时表放内存
+DEFAULT_PRAGMAS: Dict[str, str] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+}
+
+# 写入数据库文件、对之后所有连接生效的 PRAGMA: 只在 _init_db 中设置一次;
+# 其余 PRAGMA 为连接级，每次打开连接时设置
+_DATABASE_PRAGMAS = frozenset({"journal_mode"})
+
+_INSERT_SQL = """
+    INSERT INTO alerts (
+        timestamp, market, symbol, alert_type, 
+        level, value, price, slippage, side
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 @dataclass
 class AlertRecord:
@@ -37,7 +55,7 @@ class AlertStorage:
     ```python
     storage = AlertStorage("alerts.db")
     
-    # 保存告警
+    # 保存告警 (批量写入用 save_many, 单个事务提交)
     storage.save(AlertRecord(
         id=None,
         timestamp=datetime.now(),
@@ -59,16 +77,53 @@ class AlertStorage:
     ```
     """
     
-    def __init__(self, db_path: str = "data/alerts.db"):
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        db_path: str = "data/alerts.db",
+        pragmas: Optional[Dict[str, str]] = None,
+        uri: bool = False,
+    ):
+        """
+        Args:
+            db_path: 数据库文件路径 (uri=True 时为 SQLite URI)
+            pragmas: 覆盖默认 PRAGMA (如测试库可用 synchronous=OFF)
+            uri: 按 URI 打开，如 "file:alerts?mode=memory&cache=shared"
+        """
+        self.uri = uri
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self._db_pragmas = [
+            f"PRAGMA {name}={value}" for name, value in self.pragmas.items()
+            if name in _DATABASE_PRAGMAS
+        ]
+        self._conn_pragmas = [
+            f"PRAGMA {name}={value}" for name, value in self.pragmas.items()
+            if name not in _DATABASE_PRAGMAS
+        ]
+        
+        # URI 模式常驻一个连接: 共享缓存内存库在最后一个连接关闭时即被销毁
+        self._keepalive: Optional[sqlite3.Connection] = None
+        if uri:
+            self.db_path = db_path
+            self._keepalive = sqlite3.connect(db_path, uri=True)
+        else:
+            self.db_path = Path(db_path)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
         self._init_db()
     
+    def close(self) -> None:
+        """释放常驻连接 (内存库随之销毁)"""
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
+    
     @contextmanager
     def _connection(self):
         """获取数据库连接"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self.uri)
         conn.row_factory = sqlite3.Row
+        for pragma in self._conn_pragmas:
+            conn.execute(pragma)
         try:
             yield conn
             conn.commit()
@@ -81,6 +136,9 @@ class AlertStorage:
     def _init_db(self):
         """初始化数据库表"""
         with self._connection() as conn:
+            for pragma in self._db_pragmas:
+                conn.execute(pragma)
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS alerts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -115,24 +173,17 @@ class AlertStorage:
     def save(self, alert: AlertRecord) -> int:
         """保存告警记录，返回 ID"""
         with self._connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO alerts (
-                    timestamp, market, symbol, alert_type, 
-                    level, value, price, slippage, side
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                alert.timestamp.isoformat(),
-                alert.market,
-                alert.symbol,
-                alert.alert_type,
-                alert.level,
-                alert.value,
-                alert.price,
-                alert.slippage,
-                alert.side
-            ))
+            cursor = conn.execute(_INSERT_SQL, self._record_to_row(alert))
             return cursor.lastrowid
     
+    def save_many(self, alerts: List[AlertRecord]) -> List[int]:
+        """批量保存告警记录 (单个事务提交)，返回 ID 列表"""
+        with self._connection() as conn:
+            return [
+                conn.execute(_INSERT_SQL, self._record_to_row(alert)).lastrowid
+                for alert in alerts
+            ]
+    
     def get_recent(self, limit: int = 100) -> List[AlertRecord]:
         """获取最近的告警"""
         with self._connection() as conn:
@@ -180,6 +231,20 @@ class AlertStorage:
             
             return {row['level']: row['count'] for row in rows}
     
+    def _record_to_row(self, alert: AlertRecord) -> tuple:
+        """将 AlertRecord 转换为 INSERT 参数"""
+        return (
+            alert.timestamp.isoformat(),
+            alert.market,
+            alert.symbol,
+            alert.alert_type,
+            alert.level,
+            alert.value,
+            alert.price,
+            alert.slippage,
+            alert.side
+        )
+    
     def _row_to_record(self, row: sqlite3.Row) -> AlertRecord:
         """将数据库行转换为 AlertRecord"""
         return AlertRecord(
@@ -1,10 +1,11 @@
 """Risk package - 风控模块"""
-from risk.manager import RiskManager, RiskConfig, RiskLimitExceededError, CircuitBreakerTrippedError
+from risk.manager import RiskManager, RiskConfig, Side, RiskLimitExceededError, CircuitBreakerTrippedError
 from risk.position_sizer import PositionSizer, PositionSizing
 
 __all__ = [
     "RiskManager",
     "RiskConfig",
+    "Side",
     "RiskLimitExceededError",
     "CircuitBreakerTrippedError",
     "PositionSizer",
@@ -1,26 +1,146 @@
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Mapping, Optional, Any, Iterable, Sequence, Tuple, Union
 import logging
+import time
 from decimal import Decimal
+from enum import IntEnum
+
+import numpy as np
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-@dataclass
+_INF = float('inf')
+
+# Preallocated message for the tripped-breaker path (no formatting per rejected order)
+_CB_MSG = "Circuit breaker is ACTIVE. Trading halted."
+
+
+class Side(IntEnum):
+    """
+    Order side as its signed direction.
+    Accepted anywhere a "BUY"/"SELL" string is; also the int8 encoding used by
+    check_orders_batch.
+    """
+    BUY = 1
+    SELL = -1
+
+    def __str__(self) -> str:
+        return self.name
+
+
+# Signed direction per order side; unknown sides leave the position unchanged.
+_SIDE_SIGN: Dict[Union[str, Side], float] = {
+    "BUY": 1.0,
+    "SELL": -1.0,
+    Side.BUY: 1.0,
+    Side.SELL: -1.0,
+}
+
+
+def _side_sign(side: Union[str, Side]) -> float:
+    """Return +1.0 for BUY, -1.0 for SELL, 0.0 otherwise (strings are case-insensitive)."""
+    sign = _SIDE_SIGN.get(side)
+    if sign is None:
+        sign = _SIDE_SIGN.get(side.upper(), 0.0) if isinstance(side, str) else 0.0
+    return sign
+
+
+@lru_cache(maxsize=64)
+def _derive_limit_tables(
+    position_limits: Tuple[Tuple[str, float], ...],
+    order_limits: Tuple[Tuple[str, float], ...],
+) -> Tuple[Tuple[str, ...], Mapping[str, int], array, array]:
+    """
+    Build the interned symbol table and limit arrays for a set of limits.
+    Memoized (bounded), so equal configs share one set of tables.
+    """
+    pos, order = dict(position_limits), dict(order_limits)
+    symbols = tuple(dict.fromkeys([*pos, *order]))
+    return (
+        symbols,
+        MappingProxyType({symbol: i for i, symbol in enumerate(symbols)}),
+        array('d', [pos.get(s, _INF) for s in symbols]),
+        array('d', [order.get(s, _INF) for s in symbols]),
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class RiskConfig:
     """
     Configuration for Risk Manager.
+
+    Immutable: the limit dicts are copied into read-only mappings, and the config
+    is hashable by content, so equal configs share their derived limit tables.
+    To change limits at runtime, build a new config (e.g. dataclasses.replace)
+    and pass it to RiskManager.reload_limits().
     
     Attributes:
-        max_position_size (Dict[str, float]): Maximum position size allowed per symbol (in base asset).
+        max_position_size (Mapping[str, float]): Maximum position size allowed per symbol (in base asset).
         max_daily_loss (float): Maximum allowed daily loss in quote currency (blocking).
-        max_single_order_size (Dict[str, float]): Maximum size for a single order per symbol.
+        max_single_order_size (Mapping[str, float]): Maximum size for a single order per symbol.
         max_slippage_pct (float): Maximum allowed slippage percentage (e.g., 0.05 for 5%).
+        pnl_window_seconds (Optional[float]): If set, the loss limit applies to realized PnL
+            over this rolling window instead of the whole day.
     """
-    max_position_size: Dict[str, float] = field(default_factory=dict)
+    max_position_size: Mapping[str, float] = field(default_factory=dict)
     max_daily_loss: float = 1000.0
-    max_single_order_size: Dict[str, float] = field(default_factory=dict)
+    max_single_order_size: Mapping[str, float] = field(default_factory=dict)
     max_slippage_pct: float = 0.02
+    pnl_window_seconds: Optional[float] = None
+
+    # Content hash and interned limit tables derived from the fields above
+    _hash: int = field(init=False, repr=False, compare=False, default=0)
+    _symbols: Tuple[str, ...] = field(init=False, repr=False, compare=False, default=())
+    _idx: Mapping[str, int] = field(init=False, repr=False, compare=False, default_factory=dict)
+    _pos_limits: array = field(init=False, repr=False, compare=False, default_factory=lambda: array('d'))
+    _order_limits: array = field(init=False, repr=False, compare=False, default_factory=lambda: array('d'))
+
+    def __post_init__(self):
+        # Frozen dataclass: fields are set through object.__setattr__
+        set_field = object.__setattr__
+        position_limits = tuple(self.max_position_size.items())
+        order_limits = tuple(self.max_single_order_size.items())
+        set_field(self, "max_position_size", MappingProxyType(dict(position_limits)))
+        set_field(self, "max_single_order_size", MappingProxyType(dict(order_limits)))
+        # Hash ignores dict insertion order, matching dataclass equality
+        set_field(self, "_hash", hash((
+            frozenset(position_limits),
+            self.max_daily_loss,
+            frozenset(order_limits),
+            self.max_slippage_pct,
+            self.pnl_window_seconds,
+        )))
+
+        tables = _derive_limit_tables(position_limits, order_limits)
+        set_field(self, "_symbols", tables[0])
+        set_field(self, "_idx", tables[1])
+        set_field(self, "_pos_limits", tables[2])
+        set_field(self, "_order_limits", tables[3])
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Read-only mappings cannot be pickled/deep-copied: rebuild from plain dicts
+        return (type(self), (
+            dict(self.max_position_size),
+            self.max_daily_loss,
+            dict(self.max_single_order_size),
+            self.max_slippage_pct,
+            self.pnl_window_seconds,
+        ))
+
+    def limits_for(self, symbol: str) -> Tuple[float, float]:
+        """Return (max single order size, max position) for a symbol; unlimited if unconfigured."""
+        i = self._idx.get(symbol)
+        if i is None:
+            return (_INF, _INF)
+        return (self._order_limits[i], self._pos_limits[i])
 
 
 class RiskException(Exception):
@@ -42,8 +162,27 @@ class RiskManager:
     """
     Mandatory Risk Control Layer.
     Enforces 'Hard Checks' on all outgoing orders.
+
+    Not thread-safe by design: PnL and positions are plain floats updated without
+    a lock. Call from a single thread (ExecutionEngine marshals account WS fills
+    onto its event loop).
     """
 
+    __slots__ = (
+        "config",
+        "_positions",
+        "_daily_realized_pnl",
+        "_pnl_window",
+        "_window_sum",
+        "_circuit_breaker_active",
+        "check_order",
+        "_symbol_idx",
+    )
+
+    # check_order(symbol, side, size, price) is a per-instance dispatch slot:
+    # _check_order_normal while trading, _check_order_tripped once the breaker trips.
+    check_order: Callable[[str, Union[str, Side], float, float], None]
+
     def __init__(self, config: RiskConfig):
         self.config = config
         
@@ -55,42 +194,109 @@ class RiskManager:
         self._daily_realized_pnl: float = 0.0
         self._circuit_breaker_active: bool = False
         
+        # Rolling-window PnL (only when config.pnl_window_seconds is set):
+        # (timestamp, delta) entries plus their running sum, O(1) amortized per update
+        self._pnl_window: Optional[Deque[Tuple[float, float]]] = (
+            deque() if config.pnl_window_seconds else None
+        )
+        self._window_sum: float = 0.0
+        self.check_order = self._check_order_normal
+        
+        # Symbol intern table: symbol -> id used by check_orders_batch / positions_array.
+        # Append-only, so ids stay valid across reload_limits.
+        # Limits themselves live only in the config's tables.
+        self._symbol_idx: Dict[str, int] = {}
+        self._intern_config_symbols()
+        
         logger.info("RiskManager initialized with config: %s", config)
 
-    def check_order(self, symbol: str, side: str, size: float, price: float) -> None:
+    # ==================== 符号索引 ====================
+
+    def _intern_config_symbols(self) -> None:
+        """Give every configured symbol an id (existing ids are kept)."""
+        symbol_idx = self._symbol_idx
+        for symbol in self.config._symbols:
+            if symbol not in symbol_idx:
+                symbol_idx[symbol] = len(symbol_idx)
+
+    def reload_limits(self, config: RiskConfig) -> None:
+        """
+        Hot-reload limits by switching to a new config (configs are immutable).
+        Positions, PnL and symbol ids are kept; the rolling PnL window restarts
+        only if it is switched on or off.
+        """
+        self.config = config
+        if bool(config.pnl_window_seconds) != (self._pnl_window is not None):
+            self._pnl_window = deque() if config.pnl_window_seconds else None
+            self._window_sum = 0.0
+        self._intern_config_symbols()
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Return the interned integer id of a symbol.
+        Configured symbols are interned at construction (and on reload), others on
+        first use. Ids never change for the lifetime of the manager.
+        """
+        idx = self._symbol_idx.get(symbol)
+        if idx is None:
+            idx = len(self._symbol_idx)
+            self._symbol_idx[symbol] = idx
+        return idx
+
+    def positions_array(self) -> np.ndarray:
+        """Signed positions as a float64 array indexed by symbol id."""
+        positions = self._positions
+        return np.fromiter(
+            (positions.get(symbol, 0.0) for symbol in self._symbol_idx),
+            dtype=np.float64, count=len(self._symbol_idx),
+        )
+
+    # ==================== 风控检查 ====================
+
+    def _set_circuit_breaker(self, active: bool) -> None:
+        """Set the breaker flag and swap the check_order slot to match."""
+        self._circuit_breaker_active = active
+        self.check_order = self._check_order_tripped if active else self._check_order_normal
+
+    def _check_order_tripped(self, symbol: str, side: Union[str, Side], size: float, price: float) -> None:
+        """check_order while the circuit breaker is active: reject everything."""
+        raise CircuitBreakerTrippedError(_CB_MSG)
+
+    def _check_order_normal(self, symbol: str, side: Union[str, Side], size: float, price: float) -> None:
         """
         Check if an order verifies all risk constraints.
         Raises RiskException if validaton fails.
+        (Bound as check_order while the circuit breaker is not active.)
         """
-        if self._circuit_breaker_active:
-            raise CircuitBreakerTrippedError("Circuit breaker is ACTIVE. Trading halted.")
+        # Coerce int / Decimal inputs once so every comparison below runs on floats
+        size = float(size)
+        price = float(price)
+
+        # 0. Reject NaN / inf inputs: NaN compares False against every limit below.
+        # x - x is 0.0 for finite x and NaN for NaN/inf (no math.isfinite calls)
+        if size - size != 0.0 or price - price != 0.0:
+            raise RiskLimitExceededError(f"Invalid order size/price {size} @ {price} for {symbol}")
 
         # 1. Check Daily Loss (Estimating current PnL is hard without live price, 
         # so we rely on realized PnL + conservative checks)
         # In a real system, we'd add unrealized PnL check here.
-        if self._daily_realized_pnl <= -self.config.max_daily_loss:
-            self._circuit_breaker_active = True
-            logger.critical(f"Daily loss limit hit: {self._daily_realized_pnl} <= -{self.config.max_daily_loss}")
-            raise CircuitBreakerTrippedError(f"Daily loss limit exceeded: {self._daily_realized_pnl}")
+        pnl = self._daily_realized_pnl if self._pnl_window is None else self._window_pnl()
+        if pnl <= -self.config.max_daily_loss:
+            self._set_circuit_breaker(True)
+            logger.critical(f"Daily loss limit hit: {pnl} <= -{self.config.max_daily_loss}")
+            raise CircuitBreakerTrippedError(f"Daily loss limit exceeded: {pnl}")
+
+        max_size, max_pos = self.config.limits_for(symbol)
 
         # 2. Check Single Order Size
-        max_size = self.config.max_single_order_size.get(symbol, float('inf'))
         if size > max_size:
             raise RiskLimitExceededError(f"Order size {size} exceeds max limit {max_size} for {symbol}")
 
         # 3. Check Max Position Limit
-        current_pos = self._positions.get(symbol, 0.0)
         # Calculate projected position
-        # Buy adds to position, Sell subtracts
-        if side.upper() == "BUY":
-            projected_pos = current_pos + size
-        elif side.upper() == "SELL":
-            projected_pos = current_pos - size
-        else:
-            projected_pos = current_pos # Should verify side validity elsewhere or assume standard
+        # Buy adds to position, Sell subtracts (unknown side: unchanged, verified elsewhere)
+        projected_pos = self._positions.get(symbol, 0.0) + _side_sign(side) * size
 
-        max_pos = self.config.max_position_size.get(symbol, float('inf'))
-        
         # We check absolute value for max position limit usually, or just long/short caps
         # Here assuming max_pos is absolute limit for simplicity
         if abs(projected_pos) > max_pos:
@@ -98,7 +304,94 @@ class RiskManager:
                 f"Projected position {projected_pos} exceeds limit {max_pos} for {symbol}"
             )
 
-        logger.debug(f"Risk check passed for {side} {size} {symbol} @ {price}")
+        # Lazy %-formatting: the message is only built when DEBUG is enabled
+        logger.debug("Risk check passed for %s %s %s @ %s", side, size, symbol, price)
+
+    def check_orders_batch(
+        self,
+        symbol_ids: np.ndarray,
+        sides: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+    ) -> None:
+        """
+        Vectorized check_order for a burst of orders (e.g. a rebalance).
+
+        Orders are validated in sequence as if every earlier order in the burst
+        fills, so projected positions accumulate per symbol.
+        Raises on the first offending order with the same error as check_order.
+
+        Args:
+            symbol_ids: int array of ids from symbol_id()
+            sides: int8 array of Side values (+1 BUY / -1 SELL); other values leave
+                the position unchanged, same as an unknown side in check_order
+            quantities: float64 order sizes
+            prices: float64 order prices (not validated, same as check_order)
+
+        Raises:
+            ValueError: a symbol id was not issued by symbol_id() (caller bug,
+                not a risk rejection)
+        """
+        if self._circuit_breaker_active:
+            raise CircuitBreakerTrippedError(_CB_MSG)
+
+        pnl = self._daily_realized_pnl if self._pnl_window is None else self._window_pnl()
+        if pnl <= -self.config.max_daily_loss:
+            self._set_circuit_breaker(True)
+            logger.critical(f"Daily loss limit hit: {pnl} <= -{self.config.max_daily_loss}")
+            raise CircuitBreakerTrippedError(f"Daily loss limit exceeded: {pnl}")
+
+        ids = np.asarray(symbol_ids, dtype=np.intp)
+        if ids.size == 0:
+            return
+        symbols = list(self._symbol_idx)
+        if ids.min() < 0 or ids.max() >= len(symbols):
+            bad_id = ids.min() if ids.min() < 0 else ids.max()
+            raise ValueError(f"Unknown symbol id {bad_id} (use symbol_id())")
+        qtys = np.asarray(quantities, dtype=np.float64)
+        px = np.asarray(prices, dtype=np.float64)
+        invalid = ~(np.isfinite(qtys) & np.isfinite(px))
+        if invalid.any():
+            i = int(np.argmax(invalid))
+            raise RiskLimitExceededError(f"Invalid order size/price {qtys[i]} @ {px[i]} (order #{i})")
+        # Side sign per order: +1 / -1 as given, anything else 0 (as _side_sign)
+        sides = np.asarray(sides, dtype=np.float64)
+        signed = np.where(np.abs(sides) == 1.0, sides, 0.0) * qtys
+
+        # Projected position per order: a separate cumsum per symbol, seeded with the
+        # current position, so the additions happen in the same order as sequential
+        # check_order + on_fill calls (a single global cumsum loses precision)
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        positions = self.positions_array()
+        projected = np.empty_like(signed)
+        for lo, hi in zip(starts, np.r_[starts[1:], ids.size]):
+            group = order[lo:hi]
+            projected[group] = np.cumsum(np.r_[positions[sorted_ids[lo]], signed[group]])[1:]
+
+        # Limits per distinct symbol in the burst, straight from the config tables
+        uniq, inverse = np.unique(ids, return_inverse=True)
+        limits_for = self.config.limits_for
+        limits = np.array([limits_for(symbols[u]) for u in uniq], dtype=np.float64).reshape(-1, 2)
+        max_order = limits[inverse, 0]
+        max_pos = limits[inverse, 1]
+        size_violations = qtys > max_order
+        pos_violations = np.abs(projected) > max_pos
+
+        bad = size_violations | pos_violations
+        if not bad.any():
+            return
+
+        i = int(np.argmax(bad))
+        symbol = symbols[ids[i]]
+        if size_violations[i]:
+            raise RiskLimitExceededError(
+                f"Order size {qtys[i]} exceeds max limit {max_order[i]} for {symbol}"
+            )
+        raise RiskLimitExceededError(
+            f"Projected position {projected[i]} exceeds limit {max_pos[i]} for {symbol}"
+        )
 
     def on_fill(self, fill_event: Dict[str, Any]) -> None:
         """
@@ -107,19 +400,48 @@ class RiskManager:
         Args:
             fill_event: Dict containing 'symbol', 'side', 'quantity', 'price', 'fee'
         """
-        symbol = fill_event['symbol']
-        side = fill_event['side']
-        qty = float(fill_event['quantity'])
-        price = float(fill_event['price'])
-        fee = float(fill_event.get('fee', 0.0))
+        self._apply_fill(
+            fill_event['symbol'],
+            fill_event['side'],
+            float(fill_event['quantity']),
+            float(fill_event['price']),
+            float(fill_event.get('fee', 0.0)),
+        )
+
+        # Re-check circuit breaker after state update
+        self._check_circuit_breaker_after_fill()
+
+    def on_fills(self, fills: Iterable[Union[Dict[str, Any], Sequence]]) -> None:
+        """
+        Apply a batch of fills, re-checking the circuit breaker after each one
+        (same verdict as calling on_fill per fill, including negative fees/rebates).
+
+        Args:
+            fills: Fill dicts (same keys as on_fill) or positional tuples
+                (symbol, side, quantity, price[, fee]).
+        """
+        apply_fill = self._apply_fill
+        check_breaker = self._check_circuit_breaker_after_fill
+        for fill in fills:
+            if isinstance(fill, dict):
+                apply_fill(
+                    fill['symbol'],
+                    fill['side'],
+                    float(fill['quantity']),
+                    float(fill['price']),
+                    float(fill.get('fee', 0.0)),
+                )
+            else:
+                symbol, side, qty, price, *rest = fill
+                apply_fill(symbol, side, float(qty), float(price), float(rest[0]) if rest else 0.0)
+            check_breaker()
 
+    def _apply_fill(self, symbol: str, side: Union[str, Side], qty: float, price: float, fee: float) -> None:
+        """Update position and PnL for a single fill (no circuit breaker check)."""
         # Update Position
-        previous_pos = self._positions.get(symbol, 0.0)
-        
-        if side.upper() == "BUY":
-            self._positions[symbol] = previous_pos + qty
-        elif side.upper() == "SELL":
-            self._positions[symbol] = previous_pos - qty
+        sign = _side_sign(side)
+        if sign:
+            self._positions[symbol] = self._positions.get(symbol, 0.0) + sign * qty
             
         # PnL Calculation (Simplified FIFO or Average Cost could be used)
         # For HFT risk, we primarily care about Total Equity Drop.
@@ -138,12 +460,14 @@ class RiskManager:
         
         self._update_pnl_state(symbol, side, qty, price, fee)
 
-        # Re-check circuit breaker after state update
-        if self._daily_realized_pnl <= -self.config.max_daily_loss:
-            self._circuit_breaker_active = True
+    def _check_circuit_breaker_after_fill(self) -> None:
+        """Trip the circuit breaker if fills pushed PnL past the daily loss limit."""
+        pnl = self._daily_realized_pnl if self._pnl_window is None else self._window_sum
+        if pnl <= -self.config.max_daily_loss:
+            self._set_circuit_breaker(True)
             logger.warning("Circuit breaker TRIPPED after fill update.")
 
-    def _update_pnl_state(self, symbol: str, side: str, qty: float, price: float, fee: float) -> None:
+    def _update_pnl_state(self, symbol: str, side: Union[str, Side], qty: float, price: float, fee: float) -> None:
         """
         Internal helper to update PnL. 
         This is a heuristic implementation since full accounting is in Engine.
@@ -154,6 +478,8 @@ class RiskManager:
         
         # Deduct fees immediately
         self._daily_realized_pnl -= fee
+        if self._pnl_window is not None:
+            self._push_window_pnl(-fee)
         
         # This is a placeholder for logic that would normally require knowing the cost basis.
         # If we don't track cost basis, we can't calculate realized PnL on closing trades.
@@ -163,13 +489,45 @@ class RiskManager:
         
         pass 
 
-    def update_pnl(self, realized_pnl: float) -> None:
+    def update_pnl(self, realized_pnl: float, timestamp: Optional[float] = None) -> None:
         """
         External method to update PnL from the authoritative source (ExecutionEngine).
+
+        Args:
+            realized_pnl: PnL delta in quote currency
+            timestamp: time.monotonic() seconds of the realization (default: now),
+                only used by the rolling window
         """
+        realized_pnl = float(realized_pnl)
         self._daily_realized_pnl += realized_pnl
-        if self._daily_realized_pnl <= -self.config.max_daily_loss:
-            self._circuit_breaker_active = True
+        if self._pnl_window is None:
+            pnl = self._daily_realized_pnl
+        else:
+            pnl = self._push_window_pnl(realized_pnl, timestamp)
+        if pnl <= -self.config.max_daily_loss:
+            self._set_circuit_breaker(True)
+
+    def _push_window_pnl(self, delta: float, timestamp: Optional[float] = None) -> float:
+        """Add a PnL delta to the rolling window and return the window sum."""
+        now = time.monotonic() if timestamp is None else timestamp
+        self._pnl_window.append((now, delta))
+        self._window_sum += delta
+        self._evict_pnl_window(now)
+        return self._window_sum
+
+    def _evict_pnl_window(self, now: float) -> None:
+        """Drop window entries older than pnl_window_seconds, keeping the running sum."""
+        window = self._pnl_window
+        cutoff = now - self.config.pnl_window_seconds
+        while window and window[0][0] <= cutoff:
+            self._window_sum -= window.popleft()[1]
+        if not window:
+            self._window_sum = 0.0  # discard accumulated float drift
+
+    def _window_pnl(self) -> float:
+        """Realized PnL over the rolling window as of now."""
+        self._evict_pnl_window(time.monotonic())
+        return self._window_sum
 
     def get_state(self) -> Dict[str, Any]:
         """Return current risk state for monitoring."""
@@ -182,7 +540,15 @@ class RiskManager:
     def reset_daily_stats(self):
         """Reset daily stats (e.g. at 00:00 UTC)."""
         self._daily_realized_pnl = 0.0
-        self._circuit_breaker_active = False
+        if self._pnl_window is not None:
+            self._pnl_window.clear()
+            self._window_sum = 0.0
+        self._set_circuit_breaker(False)
+
+    def reset(self) -> None:
+        """Reset all state (positions, PnL, circuit breaker) to a fresh start."""
+        self._positions.clear()
+        self.reset_daily_stats()
     
     # ==================== 状态持久化 ====================
     
@@ -230,9 +596,16 @@ class RiskManager:
                 return False
             
             state = json.loads(Path(filepath).read_text())
-            self._positions = state.get("positions", {})
-            self._daily_realized_pnl = state.get("daily_realized_pnl", 0.0)
-            self._circuit_breaker_active = state.get("circuit_breaker_active", False)
+            # JSON 会把整数值读回 int，统一转为 float
+            self._positions = {
+                symbol: float(qty) for symbol, qty in state.get("positions", {}).items()
+            }
+            self._daily_realized_pnl = float(state.get("daily_realized_pnl", 0.0))
+            if self._pnl_window is not None:
+                # The rolling window is not persisted; start it fresh
+                self._pnl_window.clear()
+                self._window_sum = 0.0
+            self._set_circuit_breaker(bool(state.get("circuit_breaker_active", False)))
             
             logger.info(f"风控状态已加载: positions={len(self._positions)}, pnl={self._daily_realized_pnl}")
             return True
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Lighter WebSocket 订单簿测试
+运行: python scripts/test_ws_orderbook.py
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+
+from connectors.lighter.ws_orderbook import LocalOrderBook, LocalOrderBookWsClient
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(message)s')
+logger = logging.getLogger(__name__)
+_log = logger.info
+
+
+def on_order_book_update(market_id, order_book: LocalOrderBook):
+    """订单簿更新回调 (未开启 INFO 时跳过格式化，开启时每次推送只写一次)"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    lines = [f"\n=== Market {market_id} 订单簿 ===",
+             f"买单 (Bids): {len(order_book.bids)} 档"]
+    lines.extend(f"  {i+1}. ${price:,.2f} x {size:g}"
+                 for i, (price, size) in enumerate(order_book.top_bids(5)))
+
+    lines.append(f"\n卖单 (Asks): {len(order_book.asks)} 档")
+    lines.extend(f"  {i+1}. ${price:,.2f} x {size:g}"
+                 for i, (price, size) in enumerate(order_book.top_asks(5)))
+
+    _log("\n".join(lines))
+
+
+if __name__ == "__main__":
+    print("=== Lighter WebSocket 订单簿测试 ===")
+    print("按 Ctrl+C 退出\n")
+
+    client = LocalOrderBookWsClient(
+        order_book_ids=[0],
+        account_ids=[],
+        on_order_book_update=on_order_book_update,
+    )
+
+    try:
+        client.run()
+    except KeyboardInterrupt:
+        print("\n已停止")
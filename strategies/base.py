@@ -15,14 +15,30 @@ from connectors.base import Candlestick, OrderBook, Trade, OrderSide
 # ==================== 信号定义 ====================
 
 class SignalAction(str, Enum):
+    """
+    信号方向
+    
+    .value 字符串是对外格式 (Global ID / API / 日志)。枚举成员是单例，
+    热路径用 `is` 做身份比较，避免 str 子类 == 的富比较分派。
+    """
     BUY = "buy"
     SELL = "sell"
     HOLD = "hold"
 
 
-@dataclass
+_ACTION_TO_SIDE = {
+    SignalAction.BUY: OrderSide.BUY,
+    SignalAction.SELL: OrderSide.SELL,
+}
+
+
+@dataclass(slots=True)
 class Signal:
-    """交易信号"""
+    """
+    交易信号
+    
+    信号发出后视为不可变: side 与 Global ID 在首次计算后缓存。
+    """
     action: SignalAction
     confidence: float  # 0.0 - 1.0
     price: float  # 信号生成时的价格
@@ -33,22 +49,31 @@ class Signal:
     timestamp: datetime = field(default_factory=datetime.now)
     source: str = "strategy"
     
+    # 派生值缓存
+    _side: Optional[OrderSide] = field(default=None, init=False, repr=False, compare=False)
+    _global_id: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # 规范化为枚举成员, 保证下游 `is` 比较成立
+        if self.action.__class__ is not SignalAction:
+            self.action = SignalAction(self.action)
+        self._side = _ACTION_TO_SIDE.get(self.action)
+    
     def to_global_id(self) -> str:
-        """生成 Global Signal ID"""
-        ts = int(self.timestamp.timestamp())
-        return f"SIG_{self.action.value.upper()}_{ts}"
+        """生成 Global Signal ID (首次调用后缓存)"""
+        global_id = self._global_id
+        if global_id is None:
+            ts = int(self.timestamp.timestamp())
+            global_id = self._global_id = f"SIG_{self.action.value.upper()}_{ts}"
+        return global_id
     
     @property
     def is_entry(self) -> bool:
-        return self.action in (SignalAction.BUY, SignalAction.SELL)
+        return self._side is not None
     
     @property
     def side(self) -> Optional[OrderSide]:
-        if self.action == SignalAction.BUY:
-            return OrderSide.BUY
-        elif self.action == SignalAction.SELL:
-            return OrderSide.SELL
-        return None
+        return self._side
 
 
 # ==================== 策略基类 ====================
@@ -64,6 +89,9 @@ class BaseStrategy(ABC):
     4. generate_signal: 生成交易信号
     5. on_stop: 策略停止时调用
     
+    内置策略均声明 __slots__ 以减小实例体积、加快属性访问；
+    自定义子类不声明 __slots__ 时仍会拥有 __dict__，不受影响。
+    
     使用示例:
     ```python
     class MomentumStrategy(BaseStrategy):
@@ -97,6 +125,8 @@ class BaseStrategy(ABC):
     ```
     """
     
+    __slots__ = ("name", "_enabled", "_last_signal")
+    
     def __init__(self, name: str):
         self.name = name
         self._enabled = True
@@ -5,20 +5,24 @@
 适用于做市、价差套利等场景。
 """
 import logging
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Deque
+from typing import List, Optional
+
+import numpy as np
 
 from connectors.base import OrderBook, Candlestick
 from strategies.base import BaseStrategy, Signal, SignalAction
 
 logger = logging.getLogger(__name__)
 
+# 中间价历史长度
+PRICE_HISTORY_SIZE = 100
+
 
 # ==================== 策略配置 ====================
 
-@dataclass
+@dataclass(slots=True)
 class ScalperConfig:
     """Scalper 策略配置"""
     
@@ -71,6 +75,21 @@ class HFTScalperStrategy(BaseStrategy):
     - 建议在高流动性市场使用
     """
     
+    __slots__ = (
+        "config",
+        "_current_position",
+        "_last_signal_time",
+        "_price_ring",
+        "_ring_i",
+        "_ring_n",
+        "_signal_count",
+        "_trade_count",
+        "_buy_tp_mult",
+        "_buy_sl_mult",
+        "_sell_tp_mult",
+        "_sell_sl_mult",
+    )
+    
     def __init__(
         self,
         spread_threshold_pct: float = 0.001,
@@ -90,11 +109,21 @@ class HFTScalperStrategy(BaseStrategy):
         # 状态
         self._current_position: float = 0.0
         self._last_signal_time: Optional[datetime] = None
-        self._price_history: Deque[float] = deque(maxlen=100)
+        
+        # 中间价环形缓冲 (连续 float64 内存, 便于向量化指标)
+        self._price_ring = np.zeros(PRICE_HISTORY_SIZE, dtype=np.float64)
+        self._ring_i = 0  # 下一个写入位置
+        self._ring_n = 0  # 已写入数量
         
         # 统计
         self._signal_count = 0
         self._trade_count = 0
+        
+        # 止盈止损乘数 (仅依赖配置，构造时预计算)
+        self._buy_tp_mult = 1 + self.config.take_profit_pct
+        self._buy_sl_mult = 1 - self.config.stop_loss_pct
+        self._sell_tp_mult = 1 - self.config.take_profit_pct
+        self._sell_sl_mult = 1 + self.config.stop_loss_pct
     
     # ==================== 核心信号逻辑 ====================
     
@@ -111,16 +140,22 @@ class HFTScalperStrategy(BaseStrategy):
         if not self._check_signal_interval():
             return None
         
-        # 计算指标
-        spread_pct = self._calculate_spread_pct(orderbook)
-        imbalance = self._calculate_imbalance(orderbook, self.config.quote_depth)
         mid_price = orderbook.mid_price
-        
         if mid_price is None:
             return None
         
         # 记录价格
-        self._price_history.append(mid_price)
+        self._price_ring[self._ring_i] = mid_price
+        self._ring_i = (self._ring_i + 1) % PRICE_HISTORY_SIZE
+        if self._ring_n < PRICE_HISTORY_SIZE:
+            self._ring_n += 1
+        
+        # 价差不足时提前返回 (流动性好的市场中最常见)，跳过深度求和
+        spread_pct = self._calculate_spread_pct(orderbook, mid_price)
+        if spread_pct < self.config.spread_threshold_pct:
+            return None
+        
+        imbalance = self._calculate_imbalance(orderbook, self.config.quote_depth)
         
         # 判断是否触发
         signal = self._evaluate_signal(
@@ -131,32 +166,134 @@ class HFTScalperStrategy(BaseStrategy):
         )
         
         if signal:
-            self._signal_count += 1
-            self._last_signal_time = datetime.now()
-            logger.debug(
-                f"[HFT] 信号 #{self._signal_count}: "
-                f"{signal.action.value} @ {mid_price:.2f} "
-                f"(spread={spread_pct:.4%}, imbalance={imbalance:.2f})"
+            self._record_signal(signal, mid_price, spread_pct, imbalance)
+        
+        return signal
+    
+    def on_orderbook_batch(self, books: List[OrderBook]) -> Optional[Signal]:
+        """
+        批量订单簿回调 (突发推送合并处理)
+        
+        一次性向量化计算所有快照的价差与前 N 档不平衡度，
+        只对最后一个满足阈值的快照评估信号，中间的过期快照直接丢弃。
+        所有有效中间价仍写入价格历史。
+        """
+        if not self._enabled or not books:
+            return None
+        
+        if not self._check_signal_interval():
+            return None
+        
+        cfg = self.config
+        depth = cfg.quote_depth
+        count = len(books)
+        
+        # 前 N 档数量矩阵 (不足 N 档补 0)，空盘口的最优价为 NaN
+        bid_sizes = np.zeros((count, depth))
+        ask_sizes = np.zeros((count, depth))
+        best_bids = np.full(count, np.nan)
+        best_asks = np.full(count, np.nan)
+        for row, ob in enumerate(books):
+            bids = ob.bids[:depth]
+            asks = ob.asks[:depth]
+            if bids:
+                best_bids[row] = bids[0].price
+                bid_sizes[row, :len(bids)] = [level.size for level in bids]
+            if asks:
+                best_asks[row] = asks[0].price
+                ask_sizes[row, :len(asks)] = [level.size for level in asks]
+        
+        mid_prices = (best_bids + best_asks) / 2
+        valid = ~np.isnan(mid_prices)
+        if not valid.any():
+            return None
+        self._record_prices(mid_prices[valid])
+        
+        bid_volume = bid_sizes.sum(axis=1)
+        ask_volume = ask_sizes.sum(axis=1)
+        total = bid_volume + ask_volume
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread_pct = np.where(
+                valid & (mid_prices != 0), (best_asks - best_bids) / mid_prices, 0.0
             )
+            imbalance = np.where(total != 0, (bid_volume - ask_volume) / total, 0.0)
+        
+        qualifying = np.flatnonzero(
+            valid
+            & (spread_pct >= cfg.spread_threshold_pct)
+            & (np.abs(imbalance) >= cfg.imbalance_threshold)
+        )
+        if len(qualifying) == 0:
+            return None
+        
+        i = int(qualifying[-1])
+        mid_price = float(mid_prices[i])
+        signal = self._evaluate_signal(
+            orderbook=books[i],
+            spread_pct=float(spread_pct[i]),
+            imbalance=float(imbalance[i]),
+            mid_price=mid_price,
+        )
+        
+        if signal:
+            self._record_signal(signal, mid_price, float(spread_pct[i]), float(imbalance[i]))
         
         return signal
     
+    def _record_prices(self, prices: np.ndarray) -> None:
+        """批量写入中间价环形缓冲"""
+        count = len(prices)
+        if count >= PRICE_HISTORY_SIZE:
+            self._price_ring[:] = prices[-PRICE_HISTORY_SIZE:]
+            self._ring_i = 0
+            self._ring_n = PRICE_HISTORY_SIZE
+            return
+        
+        index = (self._ring_i + np.arange(count)) % PRICE_HISTORY_SIZE
+        self._price_ring[index] = prices
+        self._ring_i = (self._ring_i + count) % PRICE_HISTORY_SIZE
+        self._ring_n = min(self._ring_n + count, PRICE_HISTORY_SIZE)
+    
+    def _record_signal(
+        self,
+        signal: Signal,
+        mid_price: float,
+        spread_pct: float,
+        imbalance: float,
+    ) -> None:
+        """信号触发后的统计与日志"""
+        self._signal_count += 1
+        self._last_signal_time = datetime.now()
+        logger.debug(
+            "[HFT] 信号 #%d: %s @ %.2f (spread=%.4f%%, imbalance=%.2f)",
+            self._signal_count, signal.action.value, mid_price,
+            spread_pct * 100, imbalance,
+        )
+    
     def on_candle(self, candle: Candlestick) -> Optional[Signal]:
         """K 线回调 - Scalping 通常不使用"""
         return None
     
     # ==================== 指标计算 ====================
     
-    def _calculate_spread_pct(self, ob: OrderBook) -> float:
+    def _calculate_spread_pct(
+        self, 
+        ob: OrderBook, 
+        mid_price: Optional[float] = None
+    ) -> float:
         """
         计算买卖价差百分比
         
         spread_pct = (best_ask - best_bid) / mid_price
+        
+        调用方已算出 mid_price 时可直接传入，避免重复计算。
         """
-        if not ob.best_ask or not ob.best_bid or not ob.mid_price:
+        if mid_price is None:
+            mid_price = ob.mid_price
+        if not mid_price:
             return 0.0
         
-        return (ob.best_ask - ob.best_bid) / ob.mid_price
+        return (ob.best_ask - ob.best_bid) / mid_price
     
     def _calculate_imbalance(self, ob: OrderBook, depth: int = 3) -> float:
         """
@@ -168,13 +305,9 @@ class HFTScalperStrategy(BaseStrategy):
         - 正值: 买盘强于卖盘 (看涨)
         - 负值: 卖盘强于买盘 (看跌)
         """
-        bid_volume = sum(
-            level.size for level in ob.bids[:depth]
-        ) if ob.bids else 0
-        
-        ask_volume = sum(
-            level.size for level in ob.asks[:depth]
-        ) if ob.asks else 0
+        # 只读前 depth 档: 直接求和，不为整本订单簿构建数组
+        bid_volume = sum(level.size for level in ob.bids[:depth])
+        ask_volume = sum(level.size for level in ob.asks[:depth])
         
         total = bid_volume + ask_volume
         if total == 0:
@@ -188,19 +321,24 @@ class HFTScalperStrategy(BaseStrategy):
         
         模拟按市价吃掉 size 数量时的平均价格。
         """
-        levels = ob.asks if side == "buy" else ob.bids
-        remaining = size
-        total_cost = 0.0
-        
-        for level in levels:
-            fill_size = min(remaining, level.size)
-            total_cost += fill_size * level.price
-            remaining -= fill_size
-            
-            if remaining <= 0:
-                break
-        
-        filled = size - remaining
+        prices, sizes = ob.ask_arrays if side == "buy" else ob.bid_arrays
+        if size <= 0 or len(sizes) == 0:
+            return 0.0
+        
+        # 累计深度中第一个覆盖 size 的档位
+        cum_sizes = np.cumsum(sizes)
+        k = int(np.searchsorted(cum_sizes, size))
+        
+        if k >= len(sizes):
+            # 深度不足: 吃光全部档位
+            filled = float(cum_sizes[-1])
+            total_cost = float(np.dot(prices, sizes))
+        else:
+            # 前 k 档全部成交 + 第 k 档部分成交
+            filled = size
+            consumed = float(cum_sizes[k - 1]) if k > 0 else 0.0
+            total_cost = float(np.dot(prices[:k], sizes[:k])) + (size - consumed) * float(prices[k])
+        
         return total_cost / filled if filled > 0 else 0.0
     
     # ==================== 信号评估 ====================
@@ -220,23 +358,26 @@ class HFTScalperStrategy(BaseStrategy):
         2. 不平衡度足够强 (有方向判断)
         3. 当前仓位允许
         """
+        cfg = self.config
+        
         # 检查价差
-        if spread_pct < self.config.spread_threshold_pct:
+        if spread_pct < cfg.spread_threshold_pct:
             return None
         
         # 检查不平衡度
-        if abs(imbalance) < self.config.imbalance_threshold:
+        if abs(imbalance) < cfg.imbalance_threshold:
             return None
         
         # 确定方向
+        order_size = cfg.max_position_size * cfg.order_size_pct
         if imbalance > 0:
             # 买盘强 -> 做多
             action = SignalAction.BUY
-            target_position = self.config.max_position_size * self.config.order_size_pct
+            target_position = order_size
         else:
             # 卖盘强 -> 做空
             action = SignalAction.SELL
-            target_position = -self.config.max_position_size * self.config.order_size_pct
+            target_position = -order_size
         
         # 检查仓位限制
         if not self._check_position_limit(action, target_position):
@@ -246,7 +387,7 @@ class HFTScalperStrategy(BaseStrategy):
         take_profit, stop_loss = self._calculate_exits(action, mid_price)
         
         # 计算置信度 (基于不平衡度强度)
-        confidence = min(abs(imbalance) / 0.5, 1.0)  # 50% 不平衡 = 100% 置信
+        confidence = min(abs(imbalance) * 2.0, 1.0)  # 50% 不平衡 = 100% 置信
         
         return self._emit_signal(Signal(
             action=action,
@@ -266,11 +407,12 @@ class HFTScalperStrategy(BaseStrategy):
     def _check_position_limit(self, action: SignalAction, delta: float) -> bool:
         """检查仓位限制"""
         new_position = self._current_position + delta
+        max_position = self.config.max_position_size
         
-        if action == SignalAction.BUY:
-            return new_position <= self.config.max_position_size
+        if action is SignalAction.BUY:
+            return new_position <= max_position
         else:
-            return new_position >= -self.config.max_position_size
+            return new_position >= -max_position
     
     def _calculate_exits(
         self, 
@@ -278,14 +420,9 @@ class HFTScalperStrategy(BaseStrategy):
         entry_price: float
     ) -> tuple[float, float]:
         """计算止盈止损价格"""
-        if action == SignalAction.BUY:
-            take_profit = entry_price * (1 + self.config.take_profit_pct)
-            stop_loss = entry_price * (1 - self.config.stop_loss_pct)
-        else:
-            take_profit = entry_price * (1 - self.config.take_profit_pct)
-            stop_loss = entry_price * (1 + self.config.stop_loss_pct)
-        
-        return take_profit, stop_loss
+        if action is SignalAction.BUY:
+            return entry_price * self._buy_tp_mult, entry_price * self._buy_sl_mult
+        return entry_price * self._sell_tp_mult, entry_price * self._sell_sl_mult
     
     def _check_signal_interval(self) -> bool:
         """检查信号间隔是否满足"""
@@ -304,7 +441,7 @@ class HFTScalperStrategy(BaseStrategy):
         else:
             self._current_position -= filled_size
         
-        logger.info(f"[HFT] 仓位更新: {self._current_position:.4f}")
+        logger.info("[HFT] 仓位更新: %.4f", self._current_position)
     
     def reset_position(self) -> None:
         """重置仓位"""
@@ -312,6 +449,14 @@ class HFTScalperStrategy(BaseStrategy):
     
     # ==================== 状态查询 ====================
     
+    @property
+    def price_history(self) -> np.ndarray:
+        """中间价历史 (按时间顺序的副本)"""
+        if self._ring_n < PRICE_HISTORY_SIZE:
+            return self._price_ring[:self._ring_n].copy()
+        i = self._ring_i
+        return np.concatenate((self._price_ring[i:], self._price_ring[:i]))
+    
     def get_stats(self) -> dict:
         """获取策略统计"""
         return {
@@ -10,13 +10,15 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Deque, List
 
+import numpy as np
+
 from connectors.base import Candlestick, OrderBook
 from strategies.base import BaseStrategy, Signal, SignalAction
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class MomentumConfig:
     """动量策略配置"""
     
@@ -61,6 +63,20 @@ class MomentumStrategy(BaseStrategy):
     ```
     """
     
+    __slots__ = (
+        "config",
+        "_prices",
+        "_volumes",
+        "_last_signal_time",
+        "_current_position",
+        "_signal_count",
+        "_confidence_scale",
+        "_buy_tp_mult",
+        "_buy_sl_mult",
+        "_sell_tp_mult",
+        "_sell_sl_mult",
+    )
+    
     def __init__(
         self,
         roc_period: int = 10,
@@ -85,6 +101,15 @@ class MomentumStrategy(BaseStrategy):
         
         # 统计
         self._signal_count = 0
+        
+        # 仅依赖配置的常量 (构造时预计算)
+        # roc_threshold = 0: 任意非零 ROC 都给满基础置信度 (避免除零)
+        roc_threshold = self.config.roc_threshold
+        self._confidence_scale = 1.0 / (roc_threshold * 5) if roc_threshold else float("inf")
+        self._buy_tp_mult = 1 + self.config.take_profit_pct
+        self._buy_sl_mult = 1 - self.config.stop_loss_pct
+        self._sell_tp_mult = 1 - self.config.take_profit_pct
+        self._sell_sl_mult = 1 + self.config.stop_loss_pct
     
     def on_candle(self, candle: Candlestick) -> Optional[Signal]:
         """K 线回调 - 主入口"""
@@ -124,11 +149,12 @@ class MomentumStrategy(BaseStrategy):
         
         ROC = (当前价 - N周期前价) / N周期前价
         """
-        if len(self._prices) <= self.config.roc_period:
+        roc_period = self.config.roc_period
+        if len(self._prices) <= roc_period:
             return 0.0
         
         current = self._prices[-1]
-        previous = self._prices[-self.config.roc_period - 1]
+        previous = self._prices[-roc_period - 1]
         
         if previous == 0:
             return 0.0
@@ -137,10 +163,11 @@ class MomentumStrategy(BaseStrategy):
     
     def _calculate_volume_ratio(self) -> float:
         """计算成交量相对于均值的比率"""
-        if len(self._volumes) < self.config.volume_ma_period:
+        period = self.config.volume_ma_period
+        if len(self._volumes) < period:
             return 1.0
         
-        ma = sum(list(self._volumes)[-self.config.volume_ma_period:]) / self.config.volume_ma_period
+        ma = sum(list(self._volumes)[-period:]) / period
         current = self._volumes[-1]
         
         if ma == 0:
@@ -156,45 +183,60 @@ class MomentumStrategy(BaseStrategy):
     ) -> Optional[Signal]:
         """评估是否产生信号"""
         
+        cfg = self.config
+        roc_threshold = cfg.roc_threshold
+        
         # 动量不足
-        if abs(roc) < self.config.roc_threshold:
+        if abs(roc) < roc_threshold:
             return None
         
         # 成交量确认 (可选)
-        volume_confirmed = volume_ratio >= self.config.volume_ratio_threshold
+        volume_confirmed = volume_ratio >= cfg.volume_ratio_threshold
         
         # 确定方向
-        if roc > self.config.roc_threshold:
+        if roc > roc_threshold:
             action = SignalAction.BUY
-        elif roc < -self.config.roc_threshold:
+        elif roc < -roc_threshold:
             action = SignalAction.SELL
         else:
             return None
         
+        self._signal_count += 1
+        self._last_signal_time = datetime.now()
+        
+        logger.debug(
+            "[Momentum] 信号 #%d: %s @ $%.2f (ROC=%.4f%%, Vol Ratio=%.2f)",
+            self._signal_count, action.value, price, roc * 100, volume_ratio,
+        )
+        
+        return self._emit_signal(
+            self._build_signal(action, roc, volume_ratio, volume_confirmed, price)
+        )
+    
+    def _build_signal(
+        self,
+        action: SignalAction,
+        roc: float,
+        volume_ratio: float,
+        volume_confirmed: bool,
+        price: float,
+    ) -> Signal:
+        """根据已触发的指标构造信号 (置信度 + 止盈止损)"""
         # 计算置信度
         # 基础: ROC 强度 + 成交量加成
-        base_confidence = min(abs(roc) / (self.config.roc_threshold * 5), 0.8)
+        base_confidence = min(abs(roc) * self._confidence_scale, 0.8)
         volume_bonus = 0.2 if volume_confirmed else 0.0
         confidence = min(base_confidence + volume_bonus, 1.0)
         
         # 计算止盈止损
-        if action == SignalAction.BUY:
-            take_profit = price * (1 + self.config.take_profit_pct)
-            stop_loss = price * (1 - self.config.stop_loss_pct)
+        if action is SignalAction.BUY:
+            take_profit = price * self._buy_tp_mult
+            stop_loss = price * self._buy_sl_mult
         else:
-            take_profit = price * (1 - self.config.take_profit_pct)
-            stop_loss = price * (1 + self.config.stop_loss_pct)
-        
-        self._signal_count += 1
-        self._last_signal_time = datetime.now()
+            take_profit = price * self._sell_tp_mult
+            stop_loss = price * self._sell_sl_mult
         
-        logger.debug(
-            f"[Momentum] 信号 #{self._signal_count}: "
-            f"{action.value} @ ${price:.2f} "
-            f"(ROC={roc:.4%}, Vol Ratio={volume_ratio:.2f})"
-        )
-        
-        return self._emit_signal(Signal(
+        return Signal(
             action=action,
             confidence=confidence,
             price=price,
@@ -206,7 +248,88 @@ class MomentumStrategy(BaseStrategy):
                 "volume_ratio": volume_ratio,
                 "volume_confirmed": volume_confirmed,
             }
-        ))
+        )
+    
+    # ==================== 批量回测 ====================
+    
+    def run_batch(
+        self,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        timestamps: np.ndarray,
+    ) -> List[Signal]:
+        """
+        批量处理 K 线 (回测用)
+        
+        与逐根调用 on_candle 的触发规则一致，但 ROC 与成交量比率
+        一次性向量化计算，只对触发的 K 线构造 Signal。
+        冷却时间按 K 线时间戳 (毫秒) 而非系统时间判断。
+        不修改流式状态 (信号计数、最近信号)。
+        
+        Args:
+            closes: 收盘价序列
+            volumes: 成交量序列
+            timestamps: K 线时间戳序列 (毫秒)
+            
+        Returns:
+            按时间顺序排列的信号列表
+        """
+        if not self._enabled:
+            return []
+        
+        cfg = self.config
+        closes = np.asarray(closes, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        
+        roc_period = cfg.roc_period
+        count = len(closes)
+        if count <= roc_period:
+            return []
+        
+        # ROC: 第 i 根 (i >= roc_period) 对应 roc[i - roc_period]
+        previous = closes[:-roc_period]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roc = np.where(previous != 0, closes[roc_period:] / previous - 1, 0.0)
+        
+        # 成交量比率: 数据不足均线周期时为 1.0
+        ma_period = cfg.volume_ma_period
+        volume_ratio = np.ones(count)
+        if count >= ma_period:
+            ma = np.convolve(volumes, np.ones(ma_period) / ma_period, mode="valid")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                volume_ratio[ma_period - 1:] = np.where(
+                    ma != 0, volumes[ma_period - 1:] / ma, 1.0
+                )
+        
+        # 仅遍历触发的 K 线
+        fired = np.flatnonzero(np.abs(roc) > cfg.roc_threshold) + roc_period
+        cooldown_ms = cfg.min_signal_interval_sec * 1000
+        last_ts: Optional[int] = None
+        signals: List[Signal] = []
+        
+        for i in fired:
+            ts = int(timestamps[i])
+            if last_ts is not None and ts - last_ts < cooldown_ms:
+                continue
+            last_ts = ts
+            
+            bar_roc = float(roc[i - roc_period])
+            bar_volume_ratio = float(volume_ratio[i])
+            action = SignalAction.BUY if bar_roc > 0 else SignalAction.SELL
+            
+            signal = self._build_signal(
+                action,
+                bar_roc,
+                bar_volume_ratio,
+                bar_volume_ratio >= cfg.volume_ratio_threshold,
+                float(closes[i]),
+            )
+            signal.timestamp = datetime.fromtimestamp(ts / 1000)
+            signal.source = self.name
+            signals.append(signal)
+        
+        return signals
     
     def _check_cooldown(self) -> bool:
         """检查冷却时间"""
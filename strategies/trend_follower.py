@@ -8,15 +8,33 @@ import logging
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Deque
+from typing import Optional, Deque, List
+
+import numpy as np
 
 from connectors.base import Candlestick, OrderBook
 from strategies.base import BaseStrategy, Signal, SignalAction
 
 logger = logging.getLogger(__name__)
 
+# numba 可选 (未安装时批量回测退化为纯 Python 循环)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 不可用时的空装饰器"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# 价格历史长度 (流式 deque 与批量内核共用)
+HISTORY_SIZE = 200
+
 
-@dataclass
+@dataclass(slots=True)
 class TrendConfig:
     """趋势策略配置"""
     
@@ -60,6 +78,22 @@ class TrendFollowerStrategy(BaseStrategy):
     ```
     """
     
+    __slots__ = (
+        "config",
+        "_prices",
+        "_highs",
+        "_lows",
+        "_fast_ema",
+        "_slow_ema",
+        "_prev_fast_ema",
+        "_prev_slow_ema",
+        "_fast_ema_acc",
+        "_slow_ema_acc",
+        "_fast_multiplier",
+        "_slow_multiplier",
+        "_signal_count",
+    )
+    
     def __init__(
         self,
         fast_period: int = 9,
@@ -75,9 +109,9 @@ class TrendFollowerStrategy(BaseStrategy):
         )
         
         # 价格历史
-        self._prices: Deque[float] = deque(maxlen=200)
-        self._highs: Deque[float] = deque(maxlen=200)
-        self._lows: Deque[float] = deque(maxlen=200)
+        self._prices: Deque[float] = deque(maxlen=HISTORY_SIZE)
+        self._highs: Deque[float] = deque(maxlen=HISTORY_SIZE)
+        self._lows: Deque[float] = deque(maxlen=HISTORY_SIZE)
         
         # EMA 状态
         self._fast_ema: Optional[float] = None
@@ -85,6 +119,12 @@ class TrendFollowerStrategy(BaseStrategy):
         self._prev_fast_ema: Optional[float] = None
         self._prev_slow_ema: Optional[float] = None
         
+        # EMA 递推累加器 (以首根价格为种子，每根 K 线 O(1) 更新)
+        self._fast_ema_acc: Optional[float] = None
+        self._slow_ema_acc: Optional[float] = None
+        self._fast_multiplier = 2 / (self.config.fast_period + 1)
+        self._slow_multiplier = 2 / (self.config.slow_period + 1)
+        
         # 统计
         self._signal_count = 0
     
@@ -117,119 +157,197 @@ class TrendFollowerStrategy(BaseStrategy):
         return None
     
     def _update_ema(self, price: float) -> None:
-        """更新 EMA"""
+        """
+        更新 EMA
+        
+        增量递推: ema += (price - ema) * multiplier，
+        每根 K 线 O(1)，无需回放整段价格历史。
+        """
         # 保存上一根的 EMA
         self._prev_fast_ema = self._fast_ema
         self._prev_slow_ema = self._slow_ema
         
-        # 计算新 EMA
-        if len(self._prices) < self.config.slow_period:
-            return
-        
-        prices = list(self._prices)
-        
-        self._fast_ema = self._calc_ema(prices, self.config.fast_period)
-        self._slow_ema = self._calc_ema(prices, self.config.slow_period)
-    
-    def _calc_ema(self, prices: list, period: int) -> float:
-        """计算 EMA"""
-        if len(prices) < period:
-            return prices[-1]
-        
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
+        # 递推累加器 (首根价格作为种子)
+        if self._fast_ema_acc is None:
+            self._fast_ema_acc = price
+            self._slow_ema_acc = price
+        else:
+            self._fast_ema_acc += (price - self._fast_ema_acc) * self._fast_multiplier
+            self._slow_ema_acc += (price - self._slow_ema_acc) * self._slow_multiplier
         
-        for p in prices[1:]:
-            ema = (p - ema) * multiplier + ema
+        # 数据不足慢线周期时不输出
+        count = len(self._prices)
+        if count < self.config.slow_period:
+            return
         
-        return ema
+        self._fast_ema = self._fast_ema_acc if count >= self.config.fast_period else price
+        self._slow_ema = self._slow_ema_acc
     
     def _calculate_atr(self) -> float:
-        """计算 ATR"""
-        if len(self._prices) < self.config.atr_period + 1:
+        """计算 ATR (仅遍历最近 atr_period 根 K 线)"""
+        period = self.config.atr_period
+        count = len(self._prices)
+        if count < period + 1:
             return 0.0
         
-        highs = list(self._highs)
-        lows = list(self._lows)
-        closes = list(self._prices)
+        highs = self._highs
+        lows = self._lows
+        closes = self._prices
         
-        true_ranges = []
-        for i in range(1, len(highs)):
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i-1]),
-                abs(lows[i] - closes[i-1])
+        total = 0.0
+        for i in range(count - period, count):
+            high = highs[i]
+            low = lows[i]
+            prev_close = closes[i - 1]
+            total += max(
+                high - low,
+                abs(high - prev_close),
+                abs(low - prev_close)
             )
-            true_ranges.append(tr)
         
-        atr = sum(true_ranges[-self.config.atr_period:]) / self.config.atr_period
-        return atr
+        return total / period
     
     def _check_crossover(self, price: float) -> Optional[Signal]:
         """检测 EMA 交叉"""
         
-        # 金叉: 快线从下向上穿越慢线
-        golden_cross = (
-            self._prev_fast_ema <= self._prev_slow_ema and
-            self._fast_ema > self._slow_ema
-        )
-        
-        # 死叉: 快线从上向下穿越慢线
-        death_cross = (
-            self._prev_fast_ema >= self._prev_slow_ema and
-            self._fast_ema < self._slow_ema
-        )
+        cfg = self.config
+        fast_ema = self._fast_ema
+        slow_ema = self._slow_ema
         
-        if not golden_cross and not death_cross:
+        # 交叉 = EMA 差值变号 (上一根恰好相等、本根分开也算穿越)
+        diff_now = fast_ema - slow_ema
+        diff_prev = self._prev_fast_ema - self._prev_slow_ema
+        if diff_now == 0.0 or diff_now * diff_prev > 0.0:
             return None
         
+        # 金叉: 快线从下向上穿越慢线; 死叉: 快线从上向下穿越慢线
+        golden_cross = diff_now > 0.0
+        
         # 计算趋势强度
-        trend_strength = abs(self._fast_ema - self._slow_ema) / price
+        trend_strength = abs(diff_now) / price
         
-        if trend_strength < self.config.min_trend_strength:
+        if trend_strength < cfg.min_trend_strength:
             return None
         
         # 确定方向
         action = SignalAction.BUY if golden_cross else SignalAction.SELL
         
-        # ATR 止盈止损
-        atr = self._calculate_atr()
+        self._signal_count += 1
+        
+        cross_type = "金叉" if golden_cross else "死叉"
+        logger.info(
+            "[Trend] %s #%d: %s @ $%.2f (Fast=%.2f, Slow=%.2f)",
+            cross_type, self._signal_count, action.value, price,
+            fast_ema, slow_ema,
+        )
+        
+        return self._emit_signal(self._build_signal(
+            action, price, fast_ema, slow_ema, self._calculate_atr(), trend_strength
+        ))
+    
+    def _build_signal(
+        self,
+        action: SignalAction,
+        price: float,
+        fast_ema: float,
+        slow_ema: float,
+        atr: float,
+        trend_strength: float,
+    ) -> Signal:
+        """根据交叉时刻的指标构造信号 (ATR 止盈止损 + 置信度)"""
+        cfg = self.config
+        
         if atr == 0:
             atr = price * 0.01  # 默认 1%
         
-        if action == SignalAction.BUY:
-            take_profit = price + atr * self.config.take_profit_atr
-            stop_loss = price - atr * self.config.stop_loss_atr
+        tp_distance = atr * cfg.take_profit_atr
+        sl_distance = atr * cfg.stop_loss_atr
+        if action is SignalAction.BUY:
+            take_profit = price + tp_distance
+            stop_loss = price - sl_distance
         else:
-            take_profit = price - atr * self.config.take_profit_atr
-            stop_loss = price + atr * self.config.stop_loss_atr
+            take_profit = price - tp_distance
+            stop_loss = price + sl_distance
         
         # 置信度 (基于趋势强度)
-        confidence = min(trend_strength / 0.01, 1.0)
-        
-        self._signal_count += 1
-        
-        cross_type = "金叉" if golden_cross else "死叉"
-        logger.info(
-            f"[Trend] {cross_type} #{self._signal_count}: "
-            f"{action.value} @ ${price:.2f} "
-            f"(Fast={self._fast_ema:.2f}, Slow={self._slow_ema:.2f})"
-        )
+        confidence = min(trend_strength * 100.0, 1.0)  # 1% 强度 = 100% 置信
         
-        return self._emit_signal(Signal(
+        cross_type = "金叉" if action is SignalAction.BUY else "死叉"
+        return Signal(
             action=action,
             confidence=confidence,
             price=price,
             take_profit=take_profit,
             stop_loss=stop_loss,
-            reason=f"EMA {cross_type}: Fast={self._fast_ema:.2f}, Slow={self._slow_ema:.2f}",
+            reason=f"EMA {cross_type}: Fast={fast_ema:.2f}, Slow={slow_ema:.2f}",
             metadata={
-                "fast_ema": self._fast_ema,
-                "slow_ema": self._slow_ema,
+                "fast_ema": fast_ema,
+                "slow_ema": slow_ema,
                 "atr": atr,
                 "trend_strength": trend_strength,
             }
-        ))
+        )
+    
+    # ==================== 批量回测 ====================
+    
+    def run_batch(
+        self,
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> List[Signal]:
+        """
+        批量处理 K 线 (回测用)
+        
+        EMA / ATR / 交叉检测在 _trend_kernel 中逐根递推 (numba 可用时
+        JIT 编译)，与逐根调用 on_candle 的结果一致，只对触发的 K 线构造 Signal。
+        不修改流式状态 (信号计数、最近信号)。
+        
+        Args:
+            closes: 收盘价序列
+            highs: 最高价序列
+            lows: 最低价序列
+            timestamps: K 线时间戳序列 (毫秒，可选，用于标记信号时间)
+            
+        Returns:
+            按时间顺序排列的信号列表
+        """
+        if not self._enabled:
+            return []
+        
+        cfg = self.config
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        highs = np.ascontiguousarray(highs, dtype=np.float64)
+        lows = np.ascontiguousarray(lows, dtype=np.float64)
+        
+        events, fast, slow, atr = _trend_kernel(
+            closes, highs, lows,
+            self._fast_multiplier, self._slow_multiplier,
+            cfg.fast_period, cfg.slow_period, cfg.atr_period,
+            HISTORY_SIZE,
+        )
+        
+        signals: List[Signal] = []
+        for i in np.flatnonzero(events):
+            price = float(closes[i])
+            fast_ema = float(fast[i])
+            slow_ema = float(slow[i])
+            
+            trend_strength = abs(fast_ema - slow_ema) / price
+            if trend_strength < cfg.min_trend_strength:
+                continue
+            
+            action = SignalAction.BUY if events[i] > 0 else SignalAction.SELL
+            signal = self._build_signal(
+                action, price, fast_ema, slow_ema, float(atr[i]), trend_strength
+            )
+            if timestamps is not None:
+                signal.timestamp = datetime.fromtimestamp(timestamps[i] / 1000)
+            signal.source = self.name
+            signals.append(signal)
+        
+        return signals
     
     def get_stats(self) -> dict:
         """获取策略统计"""
@@ -244,3 +362,73 @@ class TrendFollowerStrategy(BaseStrategy):
                 "slow_period": self.config.slow_period,
             }
         }
+
+
+@njit(cache=True)
+def _trend_kernel(
+    closes, highs, lows,
+    fast_mult, slow_mult,
+    fast_period, slow_period, atr_period,
+    history_size,
+):
+    """
+    趋势策略逐根递推内核
+    
+    与 TrendFollowerStrategy._update_ema / _calculate_atr / _check_crossover
+    的规则逐项对应 (含 history_size 截断)。
+    
+    Returns:
+        (events, fast, slow, atr)
+        events: 1 = 金叉, -1 = 死叉, 0 = 无交叉
+        fast / slow / atr: 每根 K 线的指标快照
+    """
+    n = closes.shape[0]
+    events = np.zeros(n, dtype=np.int8)
+    fast = np.full(n, np.nan)
+    slow = np.full(n, np.nan)
+    atr = np.zeros(n)
+    
+    # 真实波幅 (首根无前收盘, 不参与 ATR)
+    tr = np.zeros(n)
+    for i in range(1, n):
+        prev_close = closes[i - 1]
+        tr[i] = max(
+            highs[i] - lows[i],
+            abs(highs[i] - prev_close),
+            abs(lows[i] - prev_close),
+        )
+    
+    fast_acc = 0.0
+    slow_acc = 0.0
+    for i in range(n):
+        price = closes[i]
+        if i == 0:
+            fast_acc = price
+            slow_acc = price
+        else:
+            fast_acc += (price - fast_acc) * fast_mult
+            slow_acc += (price - slow_acc) * slow_mult
+        
+        count = min(i + 1, history_size)
+        if count < slow_period:
+            continue
+        fast[i] = fast_acc if count >= fast_period else price
+        slow[i] = slow_acc
+        
+        if count >= atr_period + 1:
+            total = 0.0
+            for j in range(i - atr_period + 1, i + 1):
+                total += tr[j]
+            atr[i] = total / atr_period
+        
+        # 上一根尚未输出 EMA
+        if i == 0 or np.isnan(fast[i - 1]):
+            continue
+        
+        diff_now = fast[i] - slow[i]
+        diff_prev = fast[i - 1] - slow[i - 1]
+        if diff_now == 0.0 or diff_now * diff_prev > 0.0:
+            continue
+        events[i] = 1 if diff_now > 0.0 else -1
+    
+    return events, fast, slow, atr
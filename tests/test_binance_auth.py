@@ -3,112 +3,153 @@
 
 运行: pytest tests/test_binance_auth.py -v
 """
+import hashlib
+import hmac
+import sqlite3
+import uuid
+
 import pytest
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
+from connectors.binance.auth import BinanceAuth, SymbolConverter
+from monitoring.alert_storage import AlertStorage, AlertRecord
+
 
 class TestSymbolConverter:
     """SymbolConverter 测试"""
     
-    def test_to_binance_spot(self):
-        """测试转换为 Binance 现货符号"""
-        from connectors.binance.auth import SymbolConverter
-        
+    @pytest.mark.parametrize("raw, expected", [
         # 标准格式
-        assert SymbolConverter.to_binance("ETH-USDC") == "ETHUSDT"
-        assert SymbolConverter.to_binance("BTC-USDC") == "BTCUSDT"
-        assert SymbolConverter.to_binance("SOL-USDC") == "SOLUSDT"
-        
+        ("ETH-USDC", "ETHUSDT"),
+        ("BTC-USDC", "BTCUSDT"),
+        ("SOL-USDC", "SOLUSDT"),
         # USDT 对
-        assert SymbolConverter.to_binance("ETH-USDT") == "ETHUSDT"
-        
+        ("ETH-USDT", "ETHUSDT"),
         # 已经是 Binance 格式
-        assert SymbolConverter.to_binance("ETHUSDT") == "ETHUSDT"
+        ("ETHUSDT", "ETHUSDT"),
+    ])
+    def test_to_binance_spot(self, raw, expected):
+        """测试转换为 Binance 现货符号"""
+        assert SymbolConverter.to_binance(raw) == expected
     
-    def test_from_binance(self):
+    @pytest.mark.parametrize("binance, expected", [
+        ("ETHUSDT", "ETH-USDT"),
+        ("BTCUSDT", "BTC-USDT"),
+        ("SOLUSDC", "SOL-USDC"),
+    ])
+    def test_from_binance(self, binance, expected):
         """测试从 Binance 格式转换回来"""
-        from connectors.binance.auth import SymbolConverter
-        
-        assert SymbolConverter.from_binance("ETHUSDT") == "ETH-USDT"
-        assert SymbolConverter.from_binance("BTCUSDT") == "BTC-USDT"
-        assert SymbolConverter.from_binance("SOLUSDC") == "SOL-USDC"
+        assert SymbolConverter.from_binance(binance) == expected
     
-    def test_round_trip(self):
+    @pytest.mark.parametrize("symbol", ["ETH-USDT", "BTC-USDT", "SOL-USDT"])
+    def test_round_trip(self, symbol):
         """测试往返转换"""
-        from connectors.binance.auth import SymbolConverter
-        
-        symbols = ["ETH-USDT", "BTC-USDT", "SOL-USDT"]
-        for s in symbols:
-            binance = SymbolConverter.to_binance(s)
-            back = SymbolConverter.from_binance(binance)
-            assert back == s
+        binance = SymbolConverter.to_binance(symbol)
+        assert SymbolConverter.from_binance(binance) == symbol
+
+
+@pytest.fixture(scope="module")
+def binance_auth():
+    """模块共享的 HMAC 认证实例 (签名无状态，可安全复用)"""
+    return BinanceAuth(
+        api_key="test_key",
+        api_secret="test_secret",
+        sign_type="HMAC"
+    )
 
 
 class TestBinanceAuth:
     """BinanceAuth 测试"""
     
-    def test_hmac_signature(self):
+    def test_hmac_signature(self, binance_auth):
         """测试 HMAC 签名生成"""
-        from connectors.binance.auth import BinanceAuth
-        
-        auth = BinanceAuth(
-            api_key="test_key",
-            api_secret="test_secret",
-            sign_type="HMAC"
-        )
-        
         params = {"symbol": "ETHUSDT", "side": "BUY"}
-        signature = auth.sign(params)
+        signature = binance_auth.sign(params)
         
         # 验证签名是十六进制字符串
         assert isinstance(signature, str)
         assert len(signature) == 64  # SHA256 = 32 bytes = 64 hex chars
         
         # 验证签名一致性 (相同参数应生成相同签名)
-        signature2 = auth.sign(params)
+        signature2 = binance_auth.sign(params)
         assert signature == signature2
     
-    def test_sign_params_adds_timestamp(self):
+    def test_hmac_signature_matches_reference(self, binance_auth):
+        """预处理密钥的签名应与直接 hmac.new 计算一致"""
+        expected = hmac.new(
+            b"test_secret", b"symbol=ETHUSDT&side=BUY", hashlib.sha256
+        ).hexdigest()
+        assert binance_auth.sign({"symbol": "ETHUSDT", "side": "BUY"}) == expected
+    
+    def test_sign_params_adds_timestamp(self, binance_auth):
         """测试 sign_params 添加时间戳和签名"""
-        from connectors.binance.auth import BinanceAuth
-        
-        auth = BinanceAuth(
-            api_key="test_key",
-            api_secret="test_secret",
-            sign_type="HMAC"
-        )
-        
         params = {"symbol": "ETHUSDT"}
-        signed = auth.sign_params(params)
+        signed = binance_auth.sign_params(params)
         
         assert "timestamp" in signed
         assert "signature" in signed
         assert signed["symbol"] == "ETHUSDT"
     
-    def test_get_headers(self):
+    def test_get_headers(self, binance_auth):
         """测试获取请求头"""
-        from connectors.binance.auth import BinanceAuth
-        
-        auth = BinanceAuth(
-            api_key="my_api_key",
-            api_secret="my_secret",
-            sign_type="HMAC"
-        )
-        
-        headers = auth.get_headers()
-        assert headers["X-MBX-APIKEY"] == "my_api_key"
+        headers = binance_auth.get_headers()
+        assert headers["X-MBX-APIKEY"] == "test_key"
 
 
 class TestAlertStorage:
     """AlertStorage 测试"""
     
-    def test_save_and_retrieve(self, tmp_path):
+    FAST_PRAGMAS = {"journal_mode": "MEMORY", "synchronous": "OFF", "temp_store": "MEMORY"}
+    
+    @pytest.fixture
+    def fast_alert_storage(self):
+        """测试用共享缓存内存库 (每个测试独立命名，用完即弃)"""
+        storage = AlertStorage(
+            f"file:alerts_{uuid.uuid4().hex}?mode=memory&cache=shared",
+            pragmas=self.FAST_PRAGMAS,
+            uri=True,
+        )
+        yield storage
+        storage.close()
+    
+    def test_persists_to_disk(self, tmp_path):
+        """文件库重新打开后数据仍在"""
+        db_path = str(tmp_path / "test_alerts.db")
+        AlertStorage(db_path, pragmas=self.FAST_PRAGMAS).save(AlertRecord(
+            id=None,
+            timestamp=datetime.now(),
+            market="futures",
+            symbol="BTC-USDT",
+            alert_type="bid",
+            level="high",
+            value=1_000_000.0,
+            price=65000.0,
+            slippage=0.5,
+        ))
+        
+        alerts = AlertStorage(db_path, pragmas=self.FAST_PRAGMAS).get_by_symbol("BTC-USDT")
+        assert len(alerts) == 1
+        assert alerts[0].level == "high"
+    
+    def test_journal_mode_set_once(self, tmp_path):
+        """WAL 在建库时写入文件并对新连接持久生效，连接级 PRAGMA 每次连接设置"""
+        db_path = str(tmp_path / "wal_alerts.db")
+        storage = AlertStorage(db_path)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
+        # 连接级 PRAGMA 仍在每个连接上生效
+        with storage._connection() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_save_and_retrieve(self, fast_alert_storage):
         """测试保存和检索告警"""
-        from monitoring.alert_storage import AlertStorage, AlertRecord
-        
-        db_path = tmp_path / "test_alerts.db"
-        storage = AlertStorage(str(db_path))
+        storage = fast_alert_storage
         
         # 保存告警
         record = AlertRecord(
@@ -133,16 +174,13 @@ class TestAlertStorage:
         assert alerts[0].symbol == "ETH-USDT"
         assert alerts[0].level == "medium"
     
-    def test_stats_by_level(self, tmp_path):
+    def test_stats_by_level(self, fast_alert_storage):
         """测试按级别统计"""
-        from monitoring.alert_storage import AlertStorage, AlertRecord
-        
-        db_path = tmp_path / "test_alerts2.db"
-        storage = AlertStorage(str(db_path))
+        storage = fast_alert_storage
         
-        # 保存多个告警
-        for level in ["low", "low", "medium", "high"]:
-            storage.save(AlertRecord(
+        # 批量保存多个告警
+        record_ids = storage.save_many([
+            AlertRecord(
                 id=None,
                 timestamp=datetime.now(),
                 market="spot",
@@ -153,9 +191,32 @@ class TestAlertStorage:
                 price=3097.5,
                 slippage=1.2,
                 side="BUY"
-            ))
+            )
+            for level in ["low", "low", "medium", "high"]
+        ])
+        assert len(set(record_ids)) == 4
         
         stats = storage.get_stats_by_level()
         assert stats["low"] == 2
         assert stats["medium"] == 1
         assert stats["high"] == 1
+        
+        # 分组统计应走 level 覆盖索引，避免全表扫描 + 临时排序
+        with storage._connection() as conn:
+            plan = " ".join(
+                row["detail"] for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT level, COUNT(*) FROM alerts GROUP BY level"
+                )
+            )
+        assert "USING COVERING INDEX idx_alerts_level" in plan
+    
+    def test_recent_uses_timestamp_index(self, fast_alert_storage):
+        """最近告警查询应按 timestamp 索引倒序扫描"""
+        with fast_alert_storage._connection() as conn:
+            plan = " ".join(
+                row["detail"] for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM alerts ORDER BY timestamp DESC LIMIT 10"
+                )
+            )
+        assert "USING INDEX idx_alerts_timestamp" in plan
+        assert "TEMP B-TREE" not in plan
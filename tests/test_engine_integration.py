@@ -8,30 +8,98 @@ ExecutionEngine 集成测试
 4. 熔断后订单拒绝
 """
 import pytest
+import pytest_asyncio
 import asyncio
-from unittest.mock import MagicMock, AsyncMock, patch
+import threading
+from datetime import datetime, timedelta
 from engine.execution_engine import ExecutionEngine, OrderTask, OrderState
 from risk.manager import RiskManager, RiskConfig, RiskLimitExceededError, CircuitBreakerTrippedError
 from connectors.base import BaseConnector, OrderResult
 from strategies.base import Signal, SignalAction
+from connectors.lighter.account_ws import FillEvent
+
+# asyncio_mode=auto 自动识别 async 测试; 这里只需指定共享的模块级事件循环
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
 
 # ==================== Fixtures ====================
 
+# 预分配的下单结果 (只读，所有测试共享)
+_OK_RESULT = OrderResult(success=True, order_id="EX_123", average_price=2000.0, fee=0.5)
+_FAILED_RESULT = OrderResult(success=False, error="Reverted Transaction")
+
+
+class FakeConnector(BaseConnector):
+    """
+    轻量假连接器
+    
+    create_order 返回 _result，测试可直接替换 _result 模拟失败；
+    引擎不使用的接口直接抛 NotImplementedError。
+    """
+    
+    def __init__(self):
+        super().__init__(config={})
+        self._result = _OK_RESULT
+    
+    async def connect(self):
+        self._connected = True
+        return True
+    
+    async def disconnect(self):
+        self._connected = False
+    
+    async def create_order(self, *args, **kwargs):
+        return self._result
+    
+    async def cancel_order(self, order_id):
+        return True
+    
+    async def cancel_all_orders(self, symbol=None):
+        return True
+    
+    async def get_orderbook(self, symbol):
+        raise NotImplementedError
+    
+    async def get_candlesticks(self, symbol, interval, limit=100):
+        raise NotImplementedError
+    
+    async def get_ticker_price(self, symbol):
+        raise NotImplementedError
+    
+    async def get_account(self):
+        raise NotImplementedError
+    
+    async def get_position(self, symbol):
+        raise NotImplementedError
+    
+    async def stream_orderbook(self, symbol):
+        raise NotImplementedError
+    
+    async def stream_trades(self, symbol):
+        raise NotImplementedError
+
+
+class FakeAccountWS:
+    """假账户 WS: 只记录引擎注册的回调"""
+    
+    is_running = False
+    
+    def on_fill(self, callback):
+        self.fill_callback = callback
+    
+    def on_order_update(self, callback):
+        self.order_callback = callback
+
+
 @pytest.fixture
 def mock_connector():
-    """Mock 交易所连接器"""
-    connector = MagicMock(spec=BaseConnector)
-    connector.create_order = AsyncMock(
-        return_value=OrderResult(success=True, order_id="EX_123", average_price=2000.0, fee=0.5)
-    )
-    connector.cancel_order = AsyncMock(return_value=True)
-    return connector
+    """假交易所连接器"""
+    return FakeConnector()
 
 
-@pytest.fixture
-def risk_manager():
-    """标准风控配置"""
+@pytest.fixture(scope="module")
+def shared_risk_manager():
+    """标准风控配置 (模块共享，测试前重置)"""
     config = RiskConfig(
         max_position_size={"ETH-USDC": 1.0, "BTC-USDC": 0.1},
         max_single_order_size={"ETH-USDC": 1.0, "BTC-USDC": 0.1},
@@ -41,14 +109,62 @@ def risk_manager():
 
 
 @pytest.fixture
-def engine(mock_connector, risk_manager):
-    """带风控的执行引擎"""
-    return ExecutionEngine(
-        connector=mock_connector, 
-        risk_manager=risk_manager,
-        cleanup_interval_seconds=0.1,
+def risk_manager(shared_risk_manager):
+    shared_risk_manager.reset()
+    return shared_risk_manager
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_engine(shared_risk_manager):
+    """
+    带风控的执行引擎 (模块共享，只启动一次)
+    
+    worker 运行在模块级事件循环上 (见 pytestmark)。
+    """
+    engine = ExecutionEngine(
+        connector=FakeConnector(),
+        risk_manager=shared_risk_manager,
+        cleanup_interval_seconds=60,  # 清理由测试通过 _cleanup_once 显式触发
         task_ttl_seconds=0.2  # 短 TTL 便于测试清理
     )
+    yield engine
+    await engine.stop()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def engine(shared_engine):
+    """重置后的共享引擎 (已启动)"""
+    shared_engine.reset()
+    shared_engine.set_on_complete(None)
+    await shared_engine.start()
+    return shared_engine
+
+
+def track_completion(engine):
+    """
+    订阅订单完成回调
+    
+    Returns:
+        wait(order_id) 协程函数: 等待指定订单进入终态。
+        回调在 worker 将任务移入 _completed 之前同步触发，
+        等待方恢复执行时任务已在 _completed 中。
+    """
+    events = {}
+
+    def on_complete(task):
+        events.setdefault(task.id, asyncio.Event()).set()
+
+    async def wait(order_id, timeout=1.0):
+        event = events.setdefault(order_id, asyncio.Event())
+        await asyncio.wait_for(event.wait(), timeout)
+
+    engine.set_on_complete(on_complete)
+    return wait
+
+
+def expire(engine, order_id):
+    """将已完成任务的创建时间回拨到 TTL 之外"""
+    engine._completed[order_id].created_at = datetime.now() - timedelta(seconds=10)
 
 
 # ==================== 风控集成测试 ====================
@@ -56,16 +172,15 @@ def engine(mock_connector, risk_manager):
 class TestRiskIntegration:
     """风控模块集成测试"""
     
-    @pytest.mark.asyncio
     async def test_risk_check_interception(self, engine):
         """风控应在提交前拦截超限订单"""
-        await engine.start()
+        wait_done = track_completion(engine)
         
         # 1. 有效订单
         signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
-        await engine.submit(signal, "ETH-USDC", 0.5)
+        oid = await engine.submit(signal, "ETH-USDC", 0.5)
         
-        await asyncio.sleep(0.15)
+        await wait_done(oid)
         assert engine.risk_manager.get_state()["positions"]["ETH-USDC"] == 0.5
         
         # 2. 超限订单 (0.5 + 0.6 > 1.0)
@@ -73,14 +188,9 @@ class TestRiskIntegration:
         
         with pytest.raises(RiskLimitExceededError):
             await engine.submit(signal_large, "ETH-USDC", 0.6)
-            
-        await engine.stop()
-        
-    @pytest.mark.asyncio
+    
     async def test_circuit_breaker_blocks_all_orders(self, engine):
         """熔断后所有订单应被拒绝"""
-        await engine.start()
-        
         # 触发熔断
         engine.risk_manager.update_pnl(-150.0)  # > 100 限制
         
@@ -88,18 +198,15 @@ class TestRiskIntegration:
         
         with pytest.raises(CircuitBreakerTrippedError):
             await engine.submit(signal, "ETH-USDC", 0.1)
-            
-        await engine.stop()
-        
-    @pytest.mark.asyncio
+    
     async def test_on_fill_updates_risk_state(self, engine):
         """成交后应更新风控状态"""
-        await engine.start()
+        wait_done = track_completion(engine)
         
         signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
         oid = await engine.submit(signal, "ETH-USDC", 0.3)
         
-        await asyncio.sleep(0.15)
+        await wait_done(oid)
         
         # 验证仓位更新
         state = engine.risk_manager.get_state()
@@ -107,8 +214,35 @@ class TestRiskIntegration:
         
         # 验证手续费扣除
         assert state["daily_realized_pnl"] == -0.5  # fee from mock_connector
+    
+    async def test_ws_fill_applied_on_loop_thread(self, mock_connector, risk_manager):
+        """WS 线程推送的成交应转交事件循环线程更新风控"""
+        account_ws = FakeAccountWS()
+        engine = ExecutionEngine(connector=mock_connector, risk_manager=risk_manager, account_ws=account_ws)
+        await engine.start()
         
-        await engine.stop()
+        try:
+            signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
+            task = OrderTask(priority=1, id="WS_1", signal=signal, symbol="ETH-USDC", size=0.2)
+            engine._tasks[task.id] = task
+            engine._exchange_order_map["42"] = task.id
+            
+            fill = FillEvent(order_index=42, market_id=0, side="buy", price=2000.0,
+                             size=0.2, fee=0.3, timestamp=datetime.now())
+            ws_thread = threading.Thread(target=account_ws.fill_callback, args=(fill,))
+            ws_thread.start()
+            ws_thread.join()
+            
+            # WS 线程只负责投递，事件循环让出后才真正更新
+            assert risk_manager.get_state()["positions"] == {}
+            await asyncio.sleep(0)
+            
+            assert task.state == OrderState.FILLED
+            state = risk_manager.get_state()
+            assert state["positions"]["ETH-USDC"] == 0.2
+            assert state["daily_realized_pnl"] == -0.3
+        finally:
+            await engine.stop()
 
 
 # ==================== 内存管理测试 ====================
@@ -116,49 +250,41 @@ class TestRiskIntegration:
 class TestMemoryManagement:
     """内存管理测试"""
     
-    @pytest.mark.asyncio
     async def test_memory_cleanup_removes_expired_tasks(self, engine):
         """过期任务应被清理"""
-        await engine.start()
+        wait_done = track_completion(engine)
         
         signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
         oid = await engine.submit(signal, "ETH-USDC", 0.1)
         
-        await asyncio.sleep(0.1)
+        await wait_done(oid)
         assert oid in engine._completed
         
-        # 等待 TTL + cleanup interval
-        await asyncio.sleep(0.4)
+        # 超过 TTL 后触发清理
+        expire(engine, oid)
+        assert engine._cleanup_once() == 1
         
         assert oid not in engine._completed
         assert oid not in engine._tasks
-        
-        await engine.stop()
-        
-    @pytest.mark.asyncio
+    
     async def test_exchange_order_map_cleanup(self, engine):
         """_exchange_order_map 应随任务清理"""
-        await engine.start()
+        wait_done = track_completion(engine)
         
         signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
         oid = await engine.submit(signal, "ETH-USDC", 0.1)
         
-        await asyncio.sleep(0.1)
+        await wait_done(oid)
         
         # 获取交易所订单 ID
-        task = engine._tasks.get(oid)
-        exchange_order_id = task.order_id if task else None
-        
-        if exchange_order_id:
-            assert exchange_order_id in engine._exchange_order_map
-        
-        # 等待清理
-        await asyncio.sleep(0.4)
+        exchange_order_id = engine._tasks[oid].order_id
+        assert exchange_order_id in engine._exchange_order_map
         
-        if exchange_order_id:
-            assert exchange_order_id not in engine._exchange_order_map
+        # 超过 TTL 后触发清理
+        expire(engine, oid)
+        engine._cleanup_once()
         
-        await engine.stop()
+        assert exchange_order_id not in engine._exchange_order_map
 
 
 # ==================== Mock SDK 错误测试 ====================
@@ -166,59 +292,62 @@ class TestMemoryManagement:
 class TestSDKErrorHandling:
     """Mock DEX SDK 错误处理测试"""
     
-    @pytest.mark.asyncio
     async def test_sdk_failure_does_not_update_risk_state(self, mock_connector, risk_manager):
         """SDK 失败时不应更新风控状态"""
         # Mock 失败响应
-        mock_connector.create_order = AsyncMock(
-            return_value=OrderResult(success=False, error="Reverted Transaction")
-        )
+        mock_connector._result = _FAILED_RESULT
         
         engine = ExecutionEngine(
             connector=mock_connector,
             risk_manager=risk_manager,
-            cleanup_interval_seconds=1.0
+            cleanup_interval_seconds=60
         )
+        wait_done = track_completion(engine)
         await engine.start()
         
         signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
-        await engine.submit(signal, "ETH-USDC", 0.5)
+        oid = await engine.submit(signal, "ETH-USDC", 0.5)
         
-        await asyncio.sleep(0.15)
+        await wait_done(oid)
+        assert engine.get_task(oid).state == OrderState.FAILED
         
         # 仓位应保持不变
         assert risk_manager.get_state()["positions"].get("ETH-USDC", 0) == 0
         
         await engine.stop()
-        
-    @pytest.mark.asyncio
+
     async def test_sdk_timeout_order_state(self, mock_connector, risk_manager):
         """SDK 超时应将订单标记为 TIMEOUT"""
-        # Mock 超时
+        # Mock 超时: 挂起在永不完成的 Future 上，结束时取消
+        submitting = asyncio.Event()
+        never = asyncio.get_running_loop().create_future()
+        
         async def slow_create_order(*args, **kwargs):
-            await asyncio.sleep(10)  # 永远不会完成
-            return OrderResult(success=True, order_id="123")
+            submitting.set()
+            return await never
         
         mock_connector.create_order = slow_create_order
         
         engine = ExecutionEngine(
             connector=mock_connector,
             risk_manager=risk_manager,
-            cleanup_interval_seconds=1.0
+            cleanup_interval_seconds=60
         )
         await engine.start()
         
-        signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
-        oid = await engine.submit(signal, "ETH-USDC", 0.1)
-        
-        # 订单会在 10s 后超时, 这里只验证它进入了队列
-        await asyncio.sleep(0.1)
-        
-        task = engine.get_task(oid)
-        assert task is not None
-        assert task.state in (OrderState.PENDING, OrderState.SUBMITTING)
-        
-        await engine.stop()
+        try:
+            signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
+            oid = await engine.submit(signal, "ETH-USDC", 0.1)
+            
+            # 订单永远不会返回, 这里只验证它已开始提交
+            await asyncio.wait_for(submitting.wait(), timeout=1.0)
+            
+            task = engine.get_task(oid)
+            assert task is not None
+            assert task.state in (OrderState.PENDING, OrderState.SUBMITTING)
+        finally:
+            never.cancel()
+            await engine.stop()
 
 
 # ==================== 统计与状态测试 ====================
@@ -226,15 +355,14 @@ class TestSDKErrorHandling:
 class TestEngineStats:
     """引擎统计测试"""
     
-    @pytest.mark.asyncio
     async def test_get_stats(self, engine):
         """引擎统计应正确反映状态"""
-        await engine.start()
+        wait_done = track_completion(engine)
         
         signal = Signal(action=SignalAction.BUY, price=2000.0, confidence=1.0)
-        await engine.submit(signal, "ETH-USDC", 0.1)
+        oid = await engine.submit(signal, "ETH-USDC", 0.1)
         
-        await asyncio.sleep(0.15)
+        await wait_done(oid)
         
         stats = engine.get_stats()
         assert stats["total_tasks"] >= 1
@@ -8,15 +8,22 @@ RiskManager 单元测试
 4. DEX SDK 错误处理 (Mocked SDK Errors)
 5. 滑点保护 (Slippage Protection) - Placeholder
 """
+import copy
+import dataclasses
+import time
+from decimal import Decimal
+
+import numpy as np
 import pytest
 from unittest.mock import Mock, MagicMock, AsyncMock, patch
-from risk.manager import RiskManager, RiskConfig, RiskLimitExceededError, CircuitBreakerTrippedError
+from risk.manager import RiskManager, RiskConfig, Side, RiskLimitExceededError, CircuitBreakerTrippedError
 
 
 # ==================== Fixtures ====================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def risk_config():
+    """模块共享的配置原型 (只读，测试中不要直接修改)"""
     return RiskConfig(
         max_position_size={"ETH-USDC": 10.0, "BTC-USDC": 1.0},
         max_daily_loss=500.0,
@@ -25,9 +32,17 @@ def risk_config():
     )
 
 
+@pytest.fixture(scope="module")
+def shared_risk_manager(risk_config):
+    """模块共享的风控实例 (深拷贝配置，避免修改配置原型)"""
+    return RiskManager(copy.deepcopy(risk_config))
+
+
 @pytest.fixture
-def risk_manager(risk_config):
-    return RiskManager(risk_config)
+def risk_manager(shared_risk_manager):
+    """每个测试前原地重置状态 (仓位 / PnL / 熔断)，不重建实例"""
+    shared_risk_manager.reset()
+    return shared_risk_manager
 
 
 # ==================== 基础测试 ====================
@@ -48,6 +63,13 @@ class TestRiskManagerBasic:
         risk_manager.check_order("ETH-USDC", "BUY", 1.0, 2000.0)
         risk_manager.check_order("BTC-USDC", "SELL", 0.3, 50000.0)
         
+    def test_check_order_with_side_enum(self, risk_manager):
+        """Side 枚举与字符串方向等价"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": Side.BUY, "quantity": 8.0, "price": 2000.0})
+        risk_manager.check_order("ETH-USDC", Side.SELL, 5.0, 2000.0)
+        with pytest.raises(RiskLimitExceededError, match="Projected position 11.0 exceeds limit"):
+            risk_manager.check_order("ETH-USDC", Side.BUY, 3.0, 2000.0)
+        
     def test_max_single_order_size_exceeded(self, risk_manager):
         """超过单笔订单限制应拒绝"""
         with pytest.raises(RiskLimitExceededError, match="Order size 6.0 exceeds max limit"):
@@ -77,6 +99,34 @@ class TestRiskManagerBasic:
         """未定义交易对应默认允许 (无限制)"""
         # 不应抛出异常
         risk_manager.check_order("UNKNOWN-TOKEN", "BUY", 1000.0, 1.0)
+    
+    def test_reload_limits_after_config_change(self, risk_config):
+        """配置限额只读; 用新配置 reload_limits 应使新限额生效"""
+        risk_manager = RiskManager(copy.deepcopy(risk_config))
+        risk_manager.check_order("ETH-USDC", "BUY", 4.0, 2000.0)
+        
+        with pytest.raises(TypeError):
+            risk_manager.config.max_single_order_size["ETH-USDC"] = 3.0
+        risk_manager.reload_limits(dataclasses.replace(
+            risk_config, max_single_order_size={**risk_config.max_single_order_size, "ETH-USDC": 3.0}
+        ))
+        
+        with pytest.raises(RiskLimitExceededError, match="Order size 4.0 exceeds max limit 3.0"):
+            risk_manager.check_order("ETH-USDC", "BUY", 4.0, 2000.0)
+    
+    def test_reload_limits_with_new_config(self, risk_config):
+        """热更新: 切换到新配置，仓位保留"""
+        risk_manager = RiskManager(risk_config)
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": "BUY", "quantity": 4.0, "price": 2000.0})
+        risk_manager.check_order("ETH-USDC", "BUY", 5.0, 2000.0)
+        
+        risk_manager.reload_limits(dataclasses.replace(
+            risk_config, max_position_size={"ETH-USDC": 6.0, "BTC-USDC": 1.0}
+        ))
+        
+        with pytest.raises(RiskLimitExceededError, match="Projected position 9.0 exceeds limit 6.0"):
+            risk_manager.check_order("ETH-USDC", "BUY", 5.0, 2000.0)
+        assert risk_manager.get_state()["positions"]["ETH-USDC"] == 4.0
 
 
 # ==================== 熔断机制测试 ====================
@@ -128,6 +178,35 @@ class TestCircuitBreaker:
         
         # 应该可以交易
         risk_manager.check_order("ETH-USDC", "BUY", 1.0, 2000.0)
+    
+    def test_rolling_pnl_window(self, risk_config):
+        """滚动窗口: 窗口外的亏损不计入熔断"""
+        rm = RiskManager(dataclasses.replace(risk_config, pnl_window_seconds=60.0))
+        now = time.monotonic()
+        
+        rm.update_pnl(-300.0, timestamp=now - 120.0)  # 已滑出窗口
+        rm.update_pnl(-300.0, timestamp=now)
+        
+        assert rm.get_state()["daily_realized_pnl"] == -600.0
+        assert rm.get_state()["circuit_breaker"] is False
+        rm.check_order("ETH-USDC", "BUY", 1.0, 2000.0)
+        
+        # 窗口内累计 -300 - 250 = -550 触发熔断
+        rm.update_pnl(-250.0, timestamp=now)
+        assert rm.get_state()["circuit_breaker"] is True
+    
+    def test_reset_clears_positions(self, risk_manager):
+        """完全重置应同时清空仓位"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": "BUY", "quantity": 2.0, "price": 2000.0})
+        risk_manager.update_pnl(-600.0)
+        
+        risk_manager.reset()
+        
+        assert risk_manager.get_state() == {
+            "positions": {},
+            "daily_realized_pnl": 0.0,
+            "circuit_breaker": False,
+        }
 
 
 # ==================== 极端行情测试 ====================
@@ -135,16 +214,20 @@ class TestCircuitBreaker:
 class TestExtremeMarketConditions:
     """极端行情模拟测试"""
     
-    def test_flash_crash_rapid_losses(self, risk_manager):
+    @pytest.mark.parametrize("losses, tripped", [
+        ([-120.0] * 5, True),   # 第 5 笔累计 -600 超过 -500
+        ([-50.0] * 3, False),   # 累计 -150 未达限额
+        ([-600.0], True),       # 单笔巨亏
+        ([-250.0, -250.0], True),  # 恰好触及 -500
+    ], ids=["five_losses", "small_losses", "single_crash", "exact_limit"])
+    def test_flash_crash_rapid_losses(self, risk_manager, losses, tripped):
         """闪崩场景: 快速连续亏损触发熔断"""
-        # 模拟 5 笔快速亏损 (每笔 -120 USDC)
-        for i in range(5):
+        for loss in losses:
             if risk_manager.get_state()["circuit_breaker"]:
                 break
-            risk_manager.update_pnl(-120.0)
+            risk_manager.update_pnl(loss)
         
-        # 应在第 5 笔时触发 (-600 > -500)
-        assert risk_manager.get_state()["circuit_breaker"] is True
+        assert risk_manager.get_state()["circuit_breaker"] is tripped
         
     def test_position_flip_short_to_long(self, risk_manager):
         """持仓翻转: 空单转多单 (多次小单)"""
@@ -172,29 +255,13 @@ class TestExtremeMarketConditions:
         
     def test_position_flip_exceeds_limit(self, risk_manager):
         """持仓翻转超限 (累计仓位超限)"""
-        # 建立空仓 -5.0
-        risk_manager.on_fill({
-            "symbol": "ETH-USDC", 
-            "side": "SELL", 
-            "quantity": 5.0, 
-            "price": 2000.0
-        })
-        
-        # 买入 5.0 平仓: -5 + 5 = 0
-        risk_manager.on_fill({
-            "symbol": "ETH-USDC", 
-            "side": "BUY", 
-            "quantity": 5.0, 
-            "price": 2000.0
-        })
-        
-        # 买入 5.0 建多仓: 0 + 5 = 5
-        risk_manager.on_fill({
-            "symbol": "ETH-USDC", 
-            "side": "BUY", 
-            "quantity": 5.0, 
-            "price": 2000.0
-        })
+        # 建立空仓 -5.0 -> 买入 5.0 平仓 (0) -> 买入 5.0 建多仓 (5)
+        risk_manager.on_fills([
+            ("ETH-USDC", "SELL", 5.0, 2000.0),
+            ("ETH-USDC", "BUY", 5.0, 2000.0),
+            ("ETH-USDC", "BUY", 5.0, 2000.0),
+        ])
+        assert risk_manager.get_state()["positions"]["ETH-USDC"] == 5.0
         
         # 买入 5.0 再加仓: 5 + 5 = 10, 正好在限制内
         risk_manager.check_order("ETH-USDC", "BUY", 5.0, 2000.0)
@@ -243,6 +310,22 @@ class TestStatePersistence:
         state = new_rm.get_state()
         assert state["positions"]["ETH-USDC"] == 3.0
         assert state["daily_realized_pnl"] == -110.0  # -100 PnL - 10 fee
+    
+    def test_load_tripped_state_blocks_orders(self, risk_manager, risk_config, tmp_path):
+        """加载已熔断的状态后应拒绝下单，重置后恢复"""
+        filepath = str(tmp_path / "risk_state.json")
+        risk_manager.update_pnl(-600.0)
+        risk_manager.save_state(filepath)
+        
+        new_rm = RiskManager(copy.deepcopy(risk_config))
+        new_rm.check_order("ETH-USDC", "BUY", 1.0, 2000.0)
+        assert new_rm.load_state(filepath) is True
+        
+        with pytest.raises(CircuitBreakerTrippedError, match="Circuit breaker is ACTIVE"):
+            new_rm.check_order("ETH-USDC", "BUY", 1.0, 2000.0)
+        
+        new_rm.reset()
+        new_rm.check_order("ETH-USDC", "BUY", 1.0, 2000.0)
 
 
 # ==================== Mock DEX SDK 错误测试 ====================
@@ -294,6 +377,51 @@ class TestMockedSDKErrors:
         })
         
         assert risk_manager.get_state()["positions"]["ETH-USDC"] == 5.0
+    
+    def test_batch_fills_match_sequential(self, risk_config):
+        """批量成交 (dict / tuple 混用) 结果应与逐笔 on_fill 一致"""
+        fills = [
+            {"symbol": "ETH-USDC", "side": "BUY", "quantity": 3.0, "price": 2000.0, "fee": 1.0},
+            {"symbol": "ETH-USDC", "side": "SELL", "quantity": 1.0, "price": 2010.0, "fee": 0.5},
+            {"symbol": "BTC-USDC", "side": "BUY", "quantity": 0.2, "price": 60000.0},
+        ]
+        
+        sequential = RiskManager(copy.deepcopy(risk_config))
+        for fill in fills:
+            sequential.on_fill(fill)
+        
+        batch = RiskManager(copy.deepcopy(risk_config))
+        batch.on_fills([
+            fills[0],
+            ("ETH-USDC", "SELL", 1.0, 2010.0, 0.5),
+            ("BTC-USDC", "BUY", 0.2, 60000.0),
+        ])
+        
+        assert batch.get_state() == sequential.get_state()
+        assert batch.get_state()["daily_realized_pnl"] == -1.5
+    
+    def test_batch_fills_trip_circuit_breaker(self, risk_manager):
+        """批量成交手续费超限应触发熔断"""
+        risk_manager.on_fills([("ETH-USDC", "BUY", 1.0, 2000.0, 300.0)] * 2)
+        assert risk_manager.get_state()["circuit_breaker"] is True
+
+    def test_batch_fills_breaker_matches_sequential_mixed_fees(self, risk_config):
+        """正负手续费混合 (maker 返佣): 中途触发的熔断在批量路径上同样生效"""
+        fills = [
+            ("ETH-USDC", "BUY", 1.0, 2000.0, 300.0),
+            ("ETH-USDC", "SELL", 1.0, 2000.0, 250.0),   # 累计 -550 触发熔断
+            ("ETH-USDC", "BUY", 1.0, 2000.0, -200.0),   # 返佣后回到 -350
+        ]
+
+        sequential = RiskManager(copy.deepcopy(risk_config))
+        for symbol, side, qty, price, fee in fills:
+            sequential.on_fill({"symbol": symbol, "side": side, "quantity": qty, "price": price, "fee": fee})
+
+        batch = RiskManager(copy.deepcopy(risk_config))
+        batch.on_fills(fills)
+
+        assert batch.get_state() == sequential.get_state()
+        assert batch.get_state()["circuit_breaker"] is True
 
 
 # ==================== 边界条件测试 ====================
@@ -306,11 +434,29 @@ class TestEdgeCases:
         # 应该通过 (虽然无意义)
         risk_manager.check_order("ETH-USDC", "BUY", 0.0, 2000.0)
         
+    @pytest.mark.parametrize("size, price", [
+        (float("nan"), 2000.0),
+        (float("inf"), 2000.0),
+        (1.0, float("nan")),
+        (1.0, float("-inf")),
+    ], ids=["nan_size", "inf_size", "nan_price", "inf_price"])
+    def test_non_finite_order_rejected(self, risk_manager, size, price):
+        """NaN / inf 数量或价格应拒绝 (NaN 与任何限额比较都为 False)"""
+        with pytest.raises(RiskLimitExceededError, match="Invalid order size/price"):
+            risk_manager.check_order("UNKNOWN-TOKEN", "BUY", size, price)
+    
     def test_negative_price(self, risk_manager):
         """负价格订单 (理论上不应发生)"""
         # RiskManager 目前不验证价格合理性
         risk_manager.check_order("ETH-USDC", "BUY", 1.0, -100.0)
-        
+
+    def test_decimal_and_int_inputs(self, risk_manager):
+        """Decimal / int 数量与价格按 float 处理 (不与 float 仓位混算报错)"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": "BUY", "quantity": 5.0, "price": 2000.0})
+        risk_manager.check_order("ETH-USDC", "BUY", Decimal("5"), 2000)
+        with pytest.raises(RiskLimitExceededError):
+            risk_manager.check_order("ETH-USDC", "BUY", Decimal("5.1"), Decimal("2000"))
+
     def test_exact_limit_order(self, risk_manager):
         """恰好等于限制的订单应通过"""
         # 建仓 5.0
@@ -323,3 +469,167 @@ class TestEdgeCases:
         
         # 再买 5.0 (5 + 5 = 10 == 限制)
         risk_manager.check_order("ETH-USDC", "BUY", 5.0, 2000.0)
+    
+    @pytest.mark.parametrize("side, expected", [
+        ("buy", 2.0),      # 小写方向
+        ("Sell", -2.0),
+        ("HOLD", 0.0),     # 未知方向不改变仓位
+        (Side.BUY, 2.0),   # 枚举方向
+        (Side.SELL, -2.0),
+    ])
+    def test_side_case_insensitive(self, risk_manager, side, expected):
+        """方向解析不区分大小写"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": side, "quantity": 2.0, "price": 2000.0})
+        assert risk_manager.get_state()["positions"].get("ETH-USDC", 0.0) == expected
+
+
+# ==================== 符号索引测试 ====================
+
+class TestSymbolIndex:
+    """符号索引 / 批量检查测试"""
+    
+    def test_config_frozen_and_hashable(self, risk_config):
+        """配置不可变; 内容相同的配置哈希相等并共享限额表"""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            risk_config.max_daily_loss = 0.0
+        
+        clone = copy.deepcopy(risk_config)
+        assert clone == risk_config
+        assert hash(clone) == hash(risk_config)
+        assert RiskConfig(**{
+            "max_position_size": dict(risk_config.max_position_size),
+            "max_daily_loss": risk_config.max_daily_loss,
+            "max_single_order_size": dict(risk_config.max_single_order_size),
+            "max_slippage_pct": risk_config.max_slippage_pct,
+        })._pos_limits is risk_config._pos_limits
+        assert hash(dataclasses.replace(risk_config, max_daily_loss=1.0)) != hash(risk_config)
+    
+    def test_config_copies_limit_dicts(self):
+        """配置复制传入的限额 dict，之后修改原 dict 不影响配置及其哈希"""
+        limits = {"ETH-USDC": 10.0}
+        config = RiskConfig(max_position_size=limits)
+        before = hash(config)
+        
+        limits["ETH-USDC"] = 1.0
+        assert config.max_position_size["ETH-USDC"] == 10.0
+        assert hash(config) == before
+    
+    def test_config_limit_tables(self, risk_config):
+        """配置在构造时生成符号表与限额数组"""
+        assert risk_config._symbols == ("ETH-USDC", "BTC-USDC")
+        assert risk_config.limits_for("BTC-USDC") == (0.5, 1.0)
+        assert risk_config.limits_for("UNKNOWN-TOKEN") == (float("inf"), float("inf"))
+    
+    def test_symbol_ids_follow_config(self, risk_manager):
+        """已配置的交易对沿用配置中的 id，未配置的按需登记"""
+        eth = risk_manager.symbol_id("ETH-USDC")
+        btc = risk_manager.symbol_id("BTC-USDC")
+        assert [eth, btc] == [0, 1]
+        
+        other = risk_manager.symbol_id("SOL-USDC")
+        assert other >= 2
+        assert risk_manager.symbol_id("SOL-USDC") == other
+        
+        risk_manager.on_fills([("ETH-USDC", "BUY", 2.0, 2000.0), ("SOL-USDC", "SELL", 3.0, 150.0)])
+        assert risk_manager.positions_array()[[eth, btc, other]].tolist() == [2.0, 0.0, -3.0]
+    
+    def test_symbol_ids_stable_across_reload(self, risk_config):
+        """重新加载 (交易对顺序不同、新增交易对) 后已发放的 id 保持不变"""
+        rm = RiskManager(risk_config)
+        eth, btc = rm.symbol_id("ETH-USDC"), rm.symbol_id("BTC-USDC")
+        sol = rm.symbol_id("SOL-USDC")
+        rm.on_fill({"symbol": "SOL-USDC", "side": "BUY", "quantity": 3.0, "price": 150.0})
+
+        rm.reload_limits(RiskConfig(
+            max_position_size={"DOGE-USDC": 100.0, "BTC-USDC": 1.0, "SOL-USDC": 2.0, "ETH-USDC": 10.0},
+        ))
+
+        assert [rm.symbol_id(s) for s in ("ETH-USDC", "BTC-USDC", "SOL-USDC")] == [eth, btc, sol]
+        assert rm.symbol_id("DOGE-USDC") == 3
+        assert rm.positions_array()[sol] == 3.0
+        # 旧 id 仍指向 SOL: 新配置的 SOL 限额 2.0 生效
+        with pytest.raises(RiskLimitExceededError, match="Projected position 4.0 exceeds limit 2.0 for SOL-USDC"):
+            rm.check_orders_batch(np.array([sol]), np.array([Side.BUY], dtype=np.int8),
+                                  np.array([1.0]), np.array([150.0]))
+
+    @pytest.mark.parametrize("bad_id", [99, -1])
+    def test_batch_check_rejects_unknown_id(self, risk_manager, bad_id):
+        """批量检查: 未登记的 id 是调用方错误 (ValueError)，不是风控拒单"""
+        with pytest.raises(ValueError, match=f"Unknown symbol id {bad_id}"):
+            risk_manager.check_orders_batch(np.array([bad_id]), np.array([Side.BUY], dtype=np.int8),
+                                            np.array([1.0]), np.array([2000.0]))
+    
+    def test_batch_unknown_side_matches_scalar(self, risk_manager):
+        """批量检查: 非 ±1 的方向与标量路径的未知方向一致 (不改变仓位)"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": "BUY", "quantity": 8.0, "price": 2000.0})
+        risk_manager.check_order("ETH-USDC", "HOLD", 5.0, 2000.0)
+        
+        ids, _, qtys, prices = self._burst(risk_manager, [("ETH-USDC", "BUY", 5.0)] * 2)
+        risk_manager.check_orders_batch(ids, np.array([5, 0], dtype=np.int8), qtys, prices)
+
+    def _burst(self, risk_manager, orders):
+        """[(symbol, side, qty)] -> check_orders_batch 参数"""
+        ids = np.array([risk_manager.symbol_id(s) for s, _, _ in orders], dtype=np.int32)
+        sides = np.array([Side[side] for _, side, _ in orders], dtype=np.int8)
+        qtys = np.array([q for _, _, q in orders], dtype=np.float64)
+        return ids, sides, qtys, np.full(len(orders), 2000.0)
+    
+    def test_batch_check_passes_within_limits(self, risk_manager):
+        """批量检查: 全部在限额内应通过"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": "BUY", "quantity": 8.0, "price": 2000.0})
+        risk_manager.check_orders_batch(*self._burst(risk_manager, [
+            ("ETH-USDC", "SELL", 5.0),
+            ("BTC-USDC", "BUY", 0.5),
+            ("ETH-USDC", "BUY", 5.0),   # 8 - 5 + 5 = 8
+            ("UNKNOWN-TOKEN", "BUY", 1000.0),
+        ]))
+    
+    @pytest.mark.parametrize("orders, message", [
+        ([("ETH-USDC", "BUY", 1.0), ("ETH-USDC", "BUY", 6.0)], "Order size 6.0 exceeds max limit"),
+        # 批内累计: 8 + 1 + 2 = 11 > 10 (单笔均不超限)
+        ([("ETH-USDC", "BUY", 1.0), ("BTC-USDC", "BUY", 0.1), ("ETH-USDC", "BUY", 2.0)],
+         "Projected position 11.0 exceeds limit 10.0 for ETH-USDC"),
+    ], ids=["order_size", "accumulated_position"])
+    def test_batch_check_rejects_first_offender(self, risk_manager, orders, message):
+        """批量检查: 报告第一笔违规订单"""
+        risk_manager.on_fill({"symbol": "ETH-USDC", "side": "BUY", "quantity": 8.0, "price": 2000.0})
+        with pytest.raises(RiskLimitExceededError, match=message):
+            risk_manager.check_orders_batch(*self._burst(risk_manager, orders))
+    
+    def test_batch_matches_sequential_at_exact_limit(self):
+        """批量检查与逐笔 check_order + on_fill 结论一致 (恰好触及限额，大额其他交易对在前)"""
+        big = [9386.865, 2835.719, 83576.675]
+        small = [0.433, 0.762, 0.002, 0.445, 0.722]
+        limit = 0.0
+        for qty in small:
+            limit += qty  # 逐笔累加的结果恰为限额
+        orders = [("BIG-USDC", "BUY", q) for q in big] + [("SOL-USDC", "BUY", q) for q in small]
+        config = RiskConfig(max_position_size={"BIG-USDC": 1e9, "SOL-USDC": limit})
+
+        sequential = RiskManager(config)
+        for symbol, side, qty in orders:
+            sequential.check_order(symbol, side, qty, 1.0)
+            sequential.on_fill({"symbol": symbol, "side": side, "quantity": qty, "price": 1.0})
+        assert sequential.get_state()["positions"]["SOL-USDC"] == limit
+
+        batch = RiskManager(config)
+        batch.check_orders_batch(*self._burst(batch, orders))
+
+        # 再多一点就应同样拒绝
+        with pytest.raises(RiskLimitExceededError, match="exceeds limit"):
+            sequential.check_order("SOL-USDC", "BUY", 0.001, 1.0)
+        with pytest.raises(RiskLimitExceededError, match="exceeds limit"):
+            batch.check_orders_batch(*self._burst(batch, orders + [("SOL-USDC", "BUY", 0.001)]))
+
+    def test_batch_check_rejects_nan(self, risk_manager):
+        """批量检查: NaN 数量应拒绝"""
+        ids, sides, qtys, prices = self._burst(risk_manager, [("ETH-USDC", "BUY", 1.0)] * 2)
+        qtys[1] = np.nan
+        with pytest.raises(RiskLimitExceededError, match=r"Invalid order size/price nan @ 2000.0 \(order #1\)"):
+            risk_manager.check_orders_batch(ids, sides, qtys, prices)
+    
+    def test_batch_check_blocked_by_circuit_breaker(self, risk_manager):
+        """批量检查: 熔断后拒绝"""
+        risk_manager.update_pnl(-600.0)
+        with pytest.raises(CircuitBreakerTrippedError):
+            risk_manager.check_orders_batch(*self._burst(risk_manager, [("ETH-USDC", "SELL", 0.1)]))
@@ -0,0 +1,357 @@
+"""
+策略单元测试
+
+测试覆盖:
+1. HFTScalper 订单簿指标 (不平衡度 / VWAP)
+2. HFTScalper 信号触发 (单条 / 批量)
+3. TrendFollower EMA / ATR
+4. Signal 派生属性
+5. Momentum / TrendFollower 批量回测
+"""
+import numpy as np
+import pytest
+from datetime import datetime
+
+from connectors.base import Candlestick, OrderBook, OrderBookLevel, OrderSide
+from strategies.base import Signal, SignalAction
+from strategies.hft_scalper import PRICE_HISTORY_SIZE, HFTScalperStrategy
+from strategies.momentum import MomentumStrategy
+from strategies.trend_follower import TrendFollowerStrategy
+
+
+# ==================== Fixtures ====================
+
+@pytest.fixture
+def orderbook():
+    """5 档订单簿"""
+    return OrderBook(
+        symbol="ETH-USDC",
+        timestamp=datetime.now(),
+        bids=[OrderBookLevel(2000.0 - i, 1.0 + i) for i in range(5)],
+        asks=[OrderBookLevel(2001.0 + i, 0.5 + i) for i in range(5)],
+    )
+
+
+@pytest.fixture
+def scalper():
+    return HFTScalperStrategy()
+
+
+# ==================== 指标计算测试 ====================
+
+class TestScalperIndicators:
+    """订单簿指标测试"""
+
+    def test_orderbook_arrays(self, orderbook):
+        """SoA 投影应与档位列表一致"""
+        prices, sizes = orderbook.bid_arrays
+        assert prices.tolist() == [level.price for level in orderbook.bids]
+        assert sizes.tolist() == [level.size for level in orderbook.bids]
+
+        # 缓存复用
+        assert orderbook.bid_arrays is orderbook.bid_arrays
+
+    def test_imbalance(self, scalper, orderbook):
+        """不平衡度 = (买量 - 卖量) / 总量"""
+        # bids: 1 + 2 + 3 = 6, asks: 0.5 + 1.5 + 2.5 = 4.5
+        imbalance = scalper._calculate_imbalance(orderbook, depth=3)
+        assert imbalance == pytest.approx((6 - 4.5) / 10.5)
+
+    def test_imbalance_empty_book(self, scalper):
+        """空订单簿不平衡度为 0"""
+        ob = OrderBook(symbol="ETH-USDC", timestamp=datetime.now(), bids=[], asks=[])
+        assert scalper._calculate_imbalance(ob) == 0.0
+
+    def test_vwap_partial_level(self, scalper, orderbook):
+        """跨档部分成交"""
+        # 0.5 @ 2001 + 1.0 @ 2002
+        vwap = scalper._calculate_vwap(orderbook, "buy", 1.5)
+        assert vwap == pytest.approx((0.5 * 2001 + 1.0 * 2002) / 1.5)
+
+    def test_vwap_exact_level(self, scalper, orderbook):
+        """恰好吃完第一档"""
+        assert scalper._calculate_vwap(orderbook, "sell", 1.0) == pytest.approx(2000.0)
+
+    def test_vwap_insufficient_depth(self, scalper, orderbook):
+        """深度不足时按全部可成交量计算"""
+        total_size = sum(level.size for level in orderbook.asks)
+        total_cost = sum(level.size * level.price for level in orderbook.asks)
+        vwap = scalper._calculate_vwap(orderbook, "buy", total_size + 100)
+        assert vwap == pytest.approx(total_cost / total_size)
+
+
+# ==================== 信号逻辑测试 ====================
+
+def _make_book(best_bid: float, best_ask: float, bid_size: float, ask_size: float) -> OrderBook:
+    """构造 3 档等量订单簿"""
+    return OrderBook(
+        symbol="ETH-USDC",
+        timestamp=datetime.now(),
+        bids=[OrderBookLevel(best_bid - i, bid_size) for i in range(3)],
+        asks=[OrderBookLevel(best_ask + i, ask_size) for i in range(3)],
+    )
+
+
+class TestScalperSignals:
+    """on_orderbook 信号测试"""
+
+    def test_buy_signal_on_wide_spread_and_bid_imbalance(self, scalper):
+        """价差足够 + 买盘强 -> 做多"""
+        ob = _make_book(2000.0, 2004.0, bid_size=3.0, ask_size=1.0)
+        signal = scalper.on_orderbook(ob)
+
+        assert signal is not None
+        assert signal.action == SignalAction.BUY
+        assert signal.take_profit > signal.price > signal.stop_loss
+
+    def test_tight_spread_skips_imbalance(self, scalper, monkeypatch):
+        """价差不足时不计算不平衡度"""
+        def fail(*args, **kwargs):
+            raise AssertionError("imbalance should not be computed")
+
+        monkeypatch.setattr(HFTScalperStrategy, "_calculate_imbalance", fail)
+        ob = _make_book(2000.0, 2000.5, bid_size=3.0, ask_size=1.0)
+
+        assert scalper.on_orderbook(ob) is None
+
+    def test_price_history_wraps_in_order(self, scalper):
+        """环形缓冲写满后按时间顺序返回最近 N 个中间价"""
+        total = PRICE_HISTORY_SIZE + 7
+        for i in range(total):
+            scalper.on_orderbook(_make_book(2000.0 + i, 2000.5 + i, 1.0, 1.0))
+
+        history = scalper.price_history
+        expected = [2000.25 + i for i in range(total - PRICE_HISTORY_SIZE, total)]
+        assert history.tolist() == expected
+
+
+class TestScalperBatch:
+    """on_orderbook_batch 合并处理测试"""
+
+    def test_uses_last_qualifying_book(self, scalper):
+        """只对最后一个满足阈值的快照出信号"""
+        books = [
+            _make_book(2000.0, 2004.0, bid_size=3.0, ask_size=1.0),  # 买盘强
+            _make_book(2001.0, 2005.0, bid_size=1.0, ask_size=3.0),  # 卖盘强
+            _make_book(2002.0, 2002.5, bid_size=1.0, ask_size=3.0),  # 价差不足
+        ]
+        signal = scalper.on_orderbook_batch(books)
+
+        assert signal is not None
+        assert signal.action == SignalAction.SELL
+        assert signal.price == pytest.approx(2003.0)
+        assert signal.metadata["imbalance"] == pytest.approx(
+            scalper._calculate_imbalance(books[1], scalper.config.quote_depth)
+        )
+        assert scalper.price_history.tolist() == [2002.0, 2003.0, 2002.25]
+
+    def test_no_qualifying_book(self, scalper):
+        """无满足阈值的快照时不出信号"""
+        books = [_make_book(2000.0 + i, 2000.5 + i, 3.0, 1.0) for i in range(5)]
+        assert scalper.on_orderbook_batch(books) is None
+        assert len(scalper.price_history) == 5
+
+    def test_price_history_overflow(self, scalper):
+        """单批超过缓冲长度时保留最近 N 个"""
+        total = PRICE_HISTORY_SIZE + 3
+        books = [_make_book(2000.0 + i, 2000.5 + i, 1.0, 1.0) for i in range(total)]
+        scalper.on_orderbook_batch(books)
+
+        assert scalper.price_history[0] == pytest.approx(2003.25)
+        assert len(scalper.price_history) == PRICE_HISTORY_SIZE
+
+
+# ==================== 趋势策略测试 ====================
+
+def _reference_ema(prices: list, period: int) -> float:
+    """全量回放计算 EMA (参考实现)"""
+    multiplier = 2 / (period + 1)
+    ema = prices[0]
+    for p in prices[1:]:
+        ema = (p - ema) * multiplier + ema
+    return ema
+
+
+class TestTrendFollower:
+    """EMA / ATR 计算测试"""
+
+    def test_incremental_ema_matches_full_recompute(self):
+        """增量 EMA 应与全量回放结果一致"""
+        strategy = TrendFollowerStrategy(fast_period=5, slow_period=10)
+        prices = [100.0 + (i % 7) * 0.5 - (i % 3) for i in range(50)]
+
+        for i, price in enumerate(prices):
+            strategy.on_candle(Candlestick(i, price, price + 1, price - 1, price, 1.0))
+
+        assert strategy._fast_ema == pytest.approx(_reference_ema(prices, 5))
+        assert strategy._slow_ema == pytest.approx(_reference_ema(prices, 10))
+
+    def test_ema_not_ready_before_slow_period(self):
+        """数据不足慢线周期时不输出 EMA"""
+        strategy = TrendFollowerStrategy(fast_period=5, slow_period=10)
+        for i in range(9):
+            strategy.on_candle(Candlestick(i, 100.0, 101.0, 99.0, 100.0, 1.0))
+
+        assert strategy._fast_ema is None
+        assert strategy._slow_ema is None
+
+    def test_atr_uses_recent_window(self):
+        """ATR 仅取最近 atr_period 根"""
+        strategy = TrendFollowerStrategy(atr_period=3)
+        # 前 10 根大波动, 后 4 根固定波动 2.0
+        for i in range(10):
+            strategy.on_candle(Candlestick(i, 100.0, 120.0, 80.0, 100.0, 1.0))
+        for i in range(10, 14):
+            strategy.on_candle(Candlestick(i, 100.0, 101.0, 99.0, 100.0, 1.0))
+
+        assert strategy._calculate_atr() == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("prev, now, action", [
+        ((99.0, 100.0), (101.0, 100.0), SignalAction.BUY),
+        ((100.0, 100.0), (101.0, 100.0), SignalAction.BUY),
+        ((101.0, 100.0), (99.0, 100.0), SignalAction.SELL),
+        ((100.0, 100.0), (99.0, 100.0), SignalAction.SELL),
+        ((99.0, 100.0), (99.5, 100.0), None),
+        ((99.0, 100.0), (100.0, 100.0), None),
+    ])
+    def test_crossover(self, prev, now, action):
+        """差值变号 (含上一根相等) 视为交叉"""
+        strategy = TrendFollowerStrategy(min_trend_strength=0.0)
+        strategy._prev_fast_ema, strategy._prev_slow_ema = prev
+        strategy._fast_ema, strategy._slow_ema = now
+
+        signal = strategy._check_crossover(100.0)
+        assert (signal.action if signal else None) is action
+
+    def test_batch_matches_streaming(self):
+        """run_batch 结果应与逐根 on_candle 一致"""
+        count = 400
+        closes = [2000.0 + 40.0 * np.sin(i / 15.0) + (i % 5) * 0.7 for i in range(count)]
+        highs = [c + 1.0 + (i % 3) for i, c in enumerate(closes)]
+        lows = [c - 1.0 - (i % 4) for i, c in enumerate(closes)]
+
+        streaming = TrendFollowerStrategy(fast_period=5, slow_period=12, min_trend_strength=0.0)
+        expected = []
+        for i in range(count):
+            signal = streaming.on_candle(
+                Candlestick(i, closes[i], highs[i], lows[i], closes[i], 1.0)
+            )
+            if signal:
+                expected.append(signal)
+
+        batch = TrendFollowerStrategy(fast_period=5, slow_period=12, min_trend_strength=0.0)
+        signals = batch.run_batch(np.array(closes), np.array(highs), np.array(lows))
+
+        assert len(expected) > 0
+        # 批量路径不修改流式状态
+        assert batch.get_stats()["signal_count"] == 0
+        assert batch._last_signal is None
+        assert all(s.source == batch.name for s in signals)
+        assert [s.action for s in signals] == [s.action for s in expected]
+        assert [s.price for s in signals] == [s.price for s in expected]
+        for got, want in zip(signals, expected):
+            assert got.take_profit == pytest.approx(want.take_profit)
+            assert got.stop_loss == pytest.approx(want.stop_loss)
+            assert got.metadata["fast_ema"] == pytest.approx(want.metadata["fast_ema"])
+
+
+# ==================== Signal 测试 ====================
+
+class TestSignal:
+    """Signal 派生属性测试"""
+
+    @pytest.mark.parametrize("action, side", [
+        (SignalAction.BUY, OrderSide.BUY),
+        (SignalAction.SELL, OrderSide.SELL),
+        (SignalAction.HOLD, None),
+    ])
+    def test_side(self, action, side):
+        assert Signal(action=action, confidence=1.0, price=2000.0).side is side
+
+    def test_string_action_normalized(self):
+        """字符串 action 规范化为枚举成员"""
+        signal = Signal(action="sell", confidence=1.0, price=2000.0)
+        assert signal.action is SignalAction.SELL
+        assert signal.side is OrderSide.SELL
+
+    def test_global_id_cached(self):
+        """Global ID 计算一次后复用"""
+        signal = Signal(
+            action=SignalAction.SELL,
+            confidence=1.0,
+            price=2000.0,
+            timestamp=datetime.fromtimestamp(1700000000),
+        )
+        assert signal.to_global_id() == "SIG_SELL_1700000000"
+        assert signal.to_global_id() is signal.to_global_id()
+
+
+# ==================== 动量策略测试 ====================
+
+class TestMomentumBatch:
+    """run_batch 与逐根 on_candle 一致性测试"""
+
+    @staticmethod
+    def _series(count: int = 300):
+        closes = [2000.0 * (1 + 0.004 * ((i * 7) % 11 - 5) / 5) + i * 0.3 for i in range(count)]
+        volumes = [10.0 + (i * 13) % 17 for i in range(count)]
+        timestamps = [1700000000000 + i * 60_000 for i in range(count)]
+        return closes, volumes, timestamps
+
+    def test_batch_matches_streaming(self):
+        """无冷却时批量结果应与逐根回调一致"""
+        closes, volumes, timestamps = self._series()
+
+        streaming = MomentumStrategy(roc_period=5, min_signal_interval_sec=0.0)
+        expected = []
+        for c, v, ts in zip(closes, volumes, timestamps):
+            signal = streaming.on_candle(Candlestick(ts, c, c, c, c, v))
+            if signal:
+                expected.append(signal)
+
+        batch = MomentumStrategy(roc_period=5, min_signal_interval_sec=0.0)
+        signals = batch.run_batch(np.array(closes), np.array(volumes), np.array(timestamps))
+
+        assert len(expected) > 0
+        # 批量路径不修改流式状态
+        assert batch.get_stats()["signal_count"] == 0
+        assert batch._last_signal is None
+        assert all(s.source == batch.name for s in signals)
+        assert [s.action for s in signals] == [s.action for s in expected]
+        assert [s.price for s in signals] == [s.price for s in expected]
+        for got, want in zip(signals, expected):
+            assert got.confidence == pytest.approx(want.confidence)
+            assert got.metadata["roc"] == pytest.approx(want.metadata["roc"])
+            assert got.metadata["volume_ratio"] == pytest.approx(want.metadata["volume_ratio"])
+
+    def test_batch_cooldown_uses_candle_time(self):
+        """冷却按 K 线时间戳计算"""
+        closes, volumes, timestamps = self._series()
+
+        no_cooldown = MomentumStrategy(roc_period=5, min_signal_interval_sec=0.0)
+        with_cooldown = MomentumStrategy(roc_period=5, min_signal_interval_sec=600.0)
+
+        all_signals = no_cooldown.run_batch(closes, volumes, timestamps)
+        signals = with_cooldown.run_batch(closes, volumes, timestamps)
+
+        assert 0 < len(signals) < len(all_signals)
+        gaps = [
+            (b.timestamp - a.timestamp).total_seconds()
+            for a, b in zip(signals, signals[1:])
+        ]
+        assert min(gaps) >= 600.0
+
+    def test_zero_roc_threshold(self):
+        """roc_threshold = 0 仍可构造，触发的信号取满基础置信度"""
+        closes, volumes, timestamps = self._series()
+        strategy = MomentumStrategy(roc_period=5, roc_threshold=0.0, min_signal_interval_sec=0.0)
+
+        signals = strategy.run_batch(closes, volumes, timestamps)
+
+        assert signals
+        assert all(0.8 <= s.confidence <= 1.0 for s in signals)
+
+    def test_batch_too_short(self):
+        """数据不足 ROC 周期时无信号"""
+        strategy = MomentumStrategy(roc_period=10)
+        assert strategy.run_batch([1.0] * 5, [1.0] * 5, list(range(5))) == []
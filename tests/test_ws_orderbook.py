@@ -1,43 +1,140 @@
 """
-Lighter WebSocket 订单簿测试
-运行: python test_ws_orderbook.py
+单元测试: OrderBookSnapshot 前 N 档选取, LocalOrderBook & LocalOrderBookWsClient
+
+运行: pytest tests/test_ws_orderbook.py -v
+(联网手动测试见 scripts/test_ws_orderbook.py)
 """
 import json
-import logging
+import random
+from datetime import datetime
+
 import lighter
+import pytest
+
+from connectors.lighter.ws_orderbook import (
+    NUMPY_TOP_N_THRESHOLD,
+    LocalOrderBook,
+    LocalOrderBookWsClient,
+    OrderBookSnapshot,
+)
+
+
+SNAPSHOT = {
+    "bids": [{"price": "1999.5", "size": "2"}, {"price": "2000.0", "size": "1.5"},
+             {"price": "1998.0", "size": "3"}],
+    "asks": [{"price": "2001.0", "size": "0.5"}, {"price": "2000.5", "size": "1"}],
+}
+
+
+@pytest.fixture
+def book():
+    book = LocalOrderBook()
+    book.reset(SNAPSHOT)
+    return book
+
+
+class TestLocalOrderBook:
+    """本地订单簿测试"""
+
+    def test_snapshot_parses_to_float(self, book):
+        """快照按价格排序，价格与数量解析为 float"""
+        assert list(book.bids.items()) == [(1998.0, 3.0), (1999.5, 2.0), (2000.0, 1.5)]
+        assert list(book.asks.items()) == [(2000.5, 1.0), (2001.0, 0.5)]
+
+    def test_top_n(self, book):
+        """买盘从高到低、卖盘从低到高，n 超过深度时返回全部"""
+        assert book.top_bids(2) == [(2000.0, 1.5), (1999.5, 2.0)]
+        assert book.top_asks(5) == [(2000.5, 1.0), (2001.0, 0.5)]
+
+    def test_delta_updates_and_removes_levels(self, book):
+        """增量: 新增 / 覆盖档位，size 为 0 删除 (含不存在的档位)"""
+        book.apply({
+            "bids": [{"price": "2000.0", "size": "0"}, {"price": "2000.25", "size": "4"}],
+            "asks": [{"price": "2000.5", "size": "2.5"}, {"price": "2005.0", "size": "0"}],
+        })
+        assert book.top_bids(2) == [(2000.25, 4.0), (1999.5, 2.0)]
+        assert book.top_asks(2) == [(2000.5, 2.5), (2001.0, 0.5)]
+
+    def test_delta_missing_side(self, book):
+        """增量只含一侧时另一侧不变"""
+        book.apply({"asks": {"2000.5": "0"}})
+        assert book.top_asks() == [(2001.0, 0.5)]
+        assert len(book.bids) == 3
+
+    def test_dict_levels(self):
+        """档位也可为 {price: size}"""
+        book = LocalOrderBook()
+        book.reset({"bids": {"100": "1", "101": "2"}, "asks": {}})
+        assert book.top_bids() == [(101.0, 2.0), (100.0, 1.0)]
+        assert book.top_asks() == []
+
+    def test_reset_replaces_book(self, book):
+        """重新订阅的快照清空旧档位"""
+        book.reset({"bids": [{"price": "10", "size": "1"}], "asks": []})
+        assert list(book.bids.items()) == [(10.0, 1.0)]
+        assert len(book.asks) == 0
+
+
+def _random_side(count: int, seed: int) -> dict:
+    """{price: size} 字符串档位，价格不重复且无序"""
+    rng = random.Random(seed)
+    prices = rng.sample(range(100_000, 200_000), count)
+    return {f"{p / 100:.2f}": f"{rng.uniform(0.01, 5):.4f}" for p in prices}
+
+
+class TestOrderBookSnapshotTopN:
+    """OrderBookSnapshot.top_bids / top_asks 与完整排序一致 (覆盖三条选取路径)"""
+
+    @pytest.mark.parametrize("depth, n", [
+        (10, 3),                                # heapq
+        (NUMPY_TOP_N_THRESHOLD, 5),             # heapq (阈值边界)
+        (NUMPY_TOP_N_THRESHOLD + 1, 1),         # argpartition, kth = 0
+        (500, 10),                              # argpartition
+        (500, 499),                             # argpartition, kth = 最后一个
+        (20, 0),                                # n = 0: 全部
+        (20, 20),                               # n == len: 全部
+        (20, 50),                               # n > len: 全部
+        (0, 5),                                 # 空盘口
+    ], ids=["heap", "heap_threshold", "argpartition_top1", "argpartition",
+            "argpartition_kth_last", "all", "n_eq_len", "n_gt_len", "empty"])
+    def test_matches_sorted(self, depth, n):
+        bids = _random_side(depth, seed=depth)
+        asks = _random_side(depth, seed=depth + 1)
+        snapshot = OrderBookSnapshot(market_id=0, timestamp=datetime.now(), bids=bids, asks=asks)
+
+        expected_bids = sorted(((float(p), float(s)) for p, s in bids.items()), reverse=True)
+        expected_asks = sorted((float(p), float(s)) for p, s in asks.items())
+        limit = n if n > 0 else None
+
+        assert snapshot.top_bids(n) == expected_bids[:limit]
+        assert snapshot.top_asks(n) == expected_asks[:limit]
+
+
+class TestLocalOrderBookWsClient:
+    """SDK 消息分发测试 (不联网)"""
+
+    @pytest.mark.parametrize("hook", ["handle_subscribed_order_book", "handle_update_order_book"])
+    def test_sdk_hook_exists(self, hook):
+        """覆盖的钩子仍存在于 SDK WsClient 上"""
+        assert callable(getattr(lighter.WsClient, hook, None))
+
+    def test_on_message_dispatch(self):
+        """on_message 按消息类型分发到本地订单簿，回调收到 LocalOrderBook"""
+        updates = []
+        client = LocalOrderBookWsClient(
+            order_book_ids=[0],
+            account_ids=[],
+            ws_url="wss://localhost/stream",
+            on_order_book_update=lambda market_id, ob: updates.append((market_id, ob.top_bids(1))),
+        )
+
+        client.on_message(None, json.dumps({
+            "type": "subscribed/order_book", "channel": "order_book:0", "order_book": SNAPSHOT,
+        }))
+        client.on_message(None, json.dumps({
+            "type": "update/order_book", "channel": "order_book:0",
+            "order_book": {"bids": [{"price": "2000.0", "size": "0"}], "asks": []},
+        }))
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(message)s')
-
-def on_order_book_update(market_id, order_book):
-    """订单簿更新回调"""
-    bids = order_book.get('bids', {})
-    asks = order_book.get('asks', {})
-    
-    print(f"\n=== Market {market_id} 订单簿 ===")
-    print(f"买单 (Bids): {len(bids)} 档")
-    
-    # bids/asks 是字典 {price: size}
-    sorted_bids = sorted(bids.items(), key=lambda x: float(x[0]), reverse=True)[:5]
-    for i, (price, size) in enumerate(sorted_bids):
-        print(f"  {i+1}. ${float(price):,.2f} x {size}")
-    
-    print(f"\n卖单 (Asks): {len(asks)} 档")
-    sorted_asks = sorted(asks.items(), key=lambda x: float(x[0]))[:5]
-    for i, (price, size) in enumerate(sorted_asks):
-        print(f"  {i+1}. ${float(price):,.2f} x {size}")
-
-
-if __name__ == "__main__":
-    print("=== Lighter WebSocket 订单簿测试 ===")
-    print("按 Ctrl+C 退出\n")
-    
-    client = lighter.WsClient(
-        order_book_ids=[0],
-        account_ids=[],
-        on_order_book_update=on_order_book_update,
-    )
-    
-    try:
-        client.run()
-    except KeyboardInterrupt:
-        print("\n已停止")
+        assert updates == [("0", [(2000.0, 1.5)]), ("0", [(1999.5, 2.0)])]
+        assert isinstance(client.local_books["0"], LocalOrderBook)